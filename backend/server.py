@@ -1,20 +1,39 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, Request
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from pymongo import ReturnDocument, UpdateOne, ReplaceOne
+from pymongo.errors import DuplicateKeyError, BulkWriteError
 from pydantic import BaseModel, Field, EmailStr, validator
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, BinaryIO
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import jwt
 import os
 import logging
+import asyncio
+import time
+import hashlib
+import base64
+import binascii
+import json
+import shutil
+import fcntl
+import uuid
 import re
 from pathlib import Path
-from bson import ObjectId
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from bson import ObjectId, json_util
 import random
 import string
+import struct
+import math
+import numpy as np
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -32,6 +51,101 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 OTP_EXPIRE_MINUTES = 10
 
+# Password hashing pool - bcrypt is CPU bound and must never run on the event loop
+PASSWORD_HASH_EXECUTOR = os.environ.get('PASSWORD_HASH_EXECUTOR', 'thread')  # "thread" or "process"
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 2))
+PASSWORD_HASH_MAX_CONCURRENCY = int(os.environ.get('PASSWORD_HASH_MAX_CONCURRENCY', PASSWORD_HASH_WORKERS))
+PASSWORD_HASH_MAX_QUEUE = int(os.environ.get('PASSWORD_HASH_MAX_QUEUE', 256))
+
+# Principal cache - authenticated user documents kept in-process between requests
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.environ.get('PRINCIPAL_CACHE_TTL_SECONDS', 30))
+PRINCIPAL_CACHE_MAX_SIZE = int(os.environ.get('PRINCIPAL_CACHE_MAX_SIZE', 10000))
+
+# Stateless claims - opt-in mode where tokens carry role/status so authorization skips the user lookup
+AUTH_STATELESS_CLAIMS = os.environ.get('AUTH_STATELESS_CLAIMS', 'false').lower() in ('1', 'true', 'yes')
+TOKEN_VERSION_REFRESH_SECONDS = float(os.environ.get('TOKEN_VERSION_REFRESH_SECONDS', 15))
+TOKEN_VERSION_DELETED = 2 ** 62
+
+# Bulk admin actions
+BULK_ACTION_MAX_USERS = int(os.environ.get('BULK_ACTION_MAX_USERS', 500))
+
+# Keyset pagination for list endpoints - the default matches the 1000 rows lists returned before
+# paging, since the app does not follow X-Next-Cursor yet
+DEFAULT_PAGE_SIZE = int(os.environ.get('DEFAULT_PAGE_SIZE', 1000))
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', 1000))
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Song audio storage - "gridfs" (default) or "local" files under AUDIO_STORE_DIR
+AUDIO_STORE = os.environ.get('AUDIO_STORE', 'gridfs')
+AUDIO_STORE_DIR = Path(os.environ.get('AUDIO_STORE_DIR', ROOT_DIR / 'audio_store'))
+AUDIO_STREAM_CHUNK_SIZE = int(os.environ.get('AUDIO_STREAM_CHUNK_SIZE', 256 * 1024))
+AUDIO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Local disk LRU of hot song audio, keyed by content hash; 0 disables it. The size cap is per
+# process - workers sharing the directory can together hold up to workers x AUDIO_DISK_CACHE_MAX_BYTES
+AUDIO_DISK_CACHE_DIR = Path(os.environ.get('AUDIO_DISK_CACHE_DIR', ROOT_DIR / 'audio_cache'))
+AUDIO_DISK_CACHE_MAX_BYTES = int(os.environ.get('AUDIO_DISK_CACHE_MAX_BYTES', 1024 * 1024 * 1024))
+
+# Conditional GETs on public lists - ETags rotate after this long so other workers' writes show up
+PUBLIC_ETAG_MAX_AGE_SECONDS = int(os.environ.get('PUBLIC_ETAG_MAX_AGE_SECONDS', 300))
+
+# Content-addressed blobs - unreferenced blobs are collected after a grace period
+BLOB_URL_PREFIX = "/api/blobs/"
+BLOB_SWEEP_GRACE_SECONDS = int(os.environ.get('BLOB_SWEEP_GRACE_SECONDS', 3600))
+BLOB_SWEEP_INTERVAL_SECONDS = int(os.environ.get('BLOB_SWEEP_INTERVAL_SECONDS', 600))
+
+# Resumable song uploads - chunks are staged on local disk until finalize
+SONG_UPLOAD_DIR = Path(os.environ.get('SONG_UPLOAD_DIR', ROOT_DIR / 'uploads'))
+SONG_UPLOAD_MAX_SIZE = int(os.environ.get('SONG_UPLOAD_MAX_SIZE', 200 * 1024 * 1024))
+SONG_UPLOAD_MAX_CHUNK = int(os.environ.get('SONG_UPLOAD_MAX_CHUNK', 8 * 1024 * 1024))
+SONG_UPLOAD_EXPIRE_HOURS = int(os.environ.get('SONG_UPLOAD_EXPIRE_HOURS', 24))
+
+# Song catalog snapshot - listing pages cached per process until a song is added or removed
+SONG_CATALOG_TTL_SECONDS = float(os.environ.get('SONG_CATALOG_TTL_SECONDS', 60))
+SONG_CATALOG_MAX_PAGES = int(os.environ.get('SONG_CATALOG_MAX_PAGES', 256))
+
+# Pre-encoded JSON pages for public content and contacts lists, refreshed on write
+PUBLIC_CACHE_TTL_SECONDS = float(os.environ.get('PUBLIC_CACHE_TTL_SECONDS', 60))
+PUBLIC_CACHE_MAX_ENTRIES = int(os.environ.get('PUBLIC_CACHE_MAX_ENTRIES', 512))
+
+# Characters of content_ne included in content summary lists
+CONTENT_EXCERPT_LENGTH = int(os.environ.get('CONTENT_EXCERPT_LENGTH', 200))
+
+# Background audio analysis - duration, loudness gain and waveform peaks
+AUDIO_ANALYSIS_WORKERS = int(os.environ.get('AUDIO_ANALYSIS_WORKERS', 1))
+AUDIO_ANALYSIS_MAX_BYTES = int(os.environ.get('AUDIO_ANALYSIS_MAX_BYTES', 100 * 1024 * 1024))
+AUDIO_ANALYSIS_PEAKS = int(os.environ.get('AUDIO_ANALYSIS_PEAKS', 200))
+AUDIO_ANALYSIS_TARGET_DBFS = float(os.environ.get('AUDIO_ANALYSIS_TARGET_DBFS', -18.0))
+
+# Song play analytics - plays are aggregated in memory behind a local write-ahead file
+PLAY_STATS_DIR = Path(os.environ.get('PLAY_STATS_DIR', ROOT_DIR / 'play_stats'))
+PLAY_STATS_FLUSH_SECONDS = float(os.environ.get('PLAY_STATS_FLUSH_SECONDS', 5))
+PLAY_STATS_MAX_LISTEN_SECONDS = float(os.environ.get('PLAY_STATS_MAX_LISTEN_SECONDS', 6 * 3600))
+# Distinct (song, day) keys held between flushes; plays of further songs are refused until the next flush
+PLAY_STATS_MAX_PENDING_KEYS = int(os.environ.get('PLAY_STATS_MAX_PENDING_KEYS', 10000))
+
+# Admin audit log - entries are spilled to a local file and written in batches in the background
+AUDIT_LOG_DIR = Path(os.environ.get('AUDIT_LOG_DIR', ROOT_DIR / 'audit_log'))
+AUDIT_BATCH_SIZE = int(os.environ.get('AUDIT_BATCH_SIZE', 200))
+AUDIT_FLUSH_SECONDS = float(os.environ.get('AUDIT_FLUSH_SECONDS', 1))
+AUDIT_QUEUE_MAX_SIZE = int(os.environ.get('AUDIT_QUEUE_MAX_SIZE', 10000))
+
+# Delta sync - writes to synced collections carry a change sequence number
+SYNC_MAX_CHANGES = int(os.environ.get('SYNC_MAX_CHANGES', 500))
+SYNC_WRITE_TIMEOUT_SECONDS = float(os.environ.get('SYNC_WRITE_TIMEOUT_SECONDS', 30))
+
+# Admin dashboard counts - materialized in db.stats and checked against a full recount periodically
+STATS_RECONCILE_SECONDS = float(os.environ.get('STATS_RECONCILE_SECONDS', 3600))
+STATS_TIMESERIES_MAX_DAYS = int(os.environ.get('STATS_TIMESERIES_MAX_DAYS', 366))
+
+# Live admin feed - Server-Sent Events from an in-process bus, so only this worker's writes are pushed
+ADMIN_STREAM_QUEUE_SIZE = int(os.environ.get('ADMIN_STREAM_QUEUE_SIZE', 256))
+ADMIN_STREAM_MAX_SUBSCRIBERS = int(os.environ.get('ADMIN_STREAM_MAX_SUBSCRIBERS', 100))
+ADMIN_STREAM_HEARTBEAT_SECONDS = float(os.environ.get('ADMIN_STREAM_HEARTBEAT_SECONDS', 15))
+
+# Verified token cache - decoded JWT payloads kept until their own expiry
+TOKEN_CACHE_MAX_SIZE = int(os.environ.get('TOKEN_CACHE_MAX_SIZE', 4096))
+
 # Create the main app
 app = FastAPI()
 api_router = APIRouter(prefix="/api")
@@ -143,12 +257,40 @@ class ContentResponse(BaseModel):
     created_at: str
     updated_at: str
 
+class ContentSummary(BaseModel):
+    id: str
+    type: str
+    title_ne: str
+    excerpt: str
+    image: Optional[str] = None
+    author_id: str
+    created_at: str
+    updated_at: str
+
 class SongCreate(BaseModel):
     title_ne: str
     category: str
     audio_data: str
     duration: Optional[str] = "00:00"
 
+class SongUploadInit(BaseModel):
+    title_ne: str
+    category: str
+    total_size: int
+    content_type: Optional[str] = "audio/mpeg"
+    duration: Optional[str] = "00:00"
+    sha256: Optional[str] = None
+
+class SongUploadStatus(BaseModel):
+    upload_id: str
+    offset: int
+    total_size: int
+    max_chunk_size: int
+
+class PlayEvent(BaseModel):
+    listened_seconds: float = 0
+    completed: bool = False
+
 class SongResponse(BaseModel):
     id: str
     title_ne: str
@@ -180,6 +322,22 @@ class ContactResponse(BaseModel):
     order: int
     created_at: str
 
+class BulkUserAction(BaseModel):
+    user_ids: List[str]
+    action: str  # approve, reject or disable
+
+class BulkUserActionResult(BaseModel):
+    user_id: str
+    status: str  # updated, skipped, conflict, not_found or invalid_id
+    detail: Optional[str] = None
+    user: Optional[UserResponse] = None
+
+class BulkUserActionResponse(BaseModel):
+    action: str
+    updated: int
+    failed: int
+    results: List[BulkUserActionResult]
+
 class MemberUpdate(BaseModel):
     status: Optional[str] = None
     role: Optional[str] = None
@@ -204,102 +362,2821 @@ class DashboardStats(BaseModel):
     total_songs: int
     total_contacts: int
 
-# ========== HELPER FUNCTIONS ==========
+# ========== HELPER FUNCTIONS ==========
+
+def generate_otp() -> str:
+    """Generate 6-digit OTP"""
+    return ''.join(random.choices(string.digits, k=6))
+
+async def send_sms(phone: str, message: str):
+    """Mock SMS service - replace with actual SMS provider"""
+    logger.info(f"SMS to {phone}: {message}")
+    return True
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+class PasswordHasher:
+    """Runs bcrypt hashing/verification in a bounded worker pool off the event loop.
+
+    At most `max_concurrency` hashes run at once; further callers wait in line
+    and are rejected with 503 once `max_queue` of them are already waiting.
+    """
+
+    def __init__(self, executor_kind: str, workers: int, max_concurrency: int, max_queue: int):
+        self.executor_kind = executor_kind
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._executor = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Server busy, please try again")
+        
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        
+        started_at = time.perf_counter()
+        wait = started_at - queued_at
+        self.total_wait_seconds += wait
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_run_seconds += time.perf_counter() - started_at
+            self._semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "executor": self.executor_kind,
+            "workers": self.workers,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+            "avg_run_ms": round(self.total_run_seconds / self.completed * 1000, 2) if self.completed else 0.0
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+password_hasher = PasswordHasher(
+    PASSWORD_HASH_EXECUTOR,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_CONCURRENCY,
+    PASSWORD_HASH_MAX_QUEUE
+)
+
+class PrincipalCache:
+    """TTL and size bounded LRU of user documents keyed by user id.
+
+    Entries are per process, so handlers that change a user must call
+    `invalidate`; the TTL bounds staleness across worker processes.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str) -> Optional[dict]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, user = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return dict(user)
+
+    def set(self, user_id: str, user: dict):
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, dict(user))
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: str):
+        if self._entries.pop(str(user_id), None) is not None:
+            self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_CACHE_MAX_SIZE)
+
+class TokenVersionTable:
+    """Minimum valid token version per user, for users whose access changed recently.
+
+    Claims tokens carrying an older `ver` are treated as stale. Entries only need
+    to outlive the longest token lifetime, so the table stays small; it is mirrored
+    in `db.token_revocations` so every worker process converges on it.
+    """
+
+    def __init__(self):
+        self._min_versions: Dict[str, tuple] = {}
+        self.stale_hits = 0
+
+    def record(self, user_id: str, min_version: int, expire_at: datetime):
+        current = self._min_versions.get(user_id)
+        if current is None or current[0] < min_version:
+            self._min_versions[user_id] = (min_version, expire_at)
+
+    def is_stale(self, user_id: str, version: int) -> bool:
+        entry = self._min_versions.get(user_id)
+        if entry is None or version >= entry[0]:
+            return False
+        self.stale_hits += 1
+        return True
+
+    async def refresh(self):
+        now = datetime.utcnow()
+        self._min_versions = {k: v for k, v in self._min_versions.items() if v[1] > now}
+        async for record in db.token_revocations.find({"expire_at": {"$gt": now}}):
+            self.record(record["_id"], record["min_version"], record["expire_at"])
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "enabled": AUTH_STATELESS_CLAIMS,
+            "size": len(self._min_versions),
+            "stale_hits": self.stale_hits
+        }
+
+token_versions = TokenVersionTable()
+
+async def refresh_token_versions_periodically():
+    while True:
+        try:
+            await token_versions.refresh()
+        except Exception as e:
+            logger.warning(f"Token version refresh failed: {e}")
+        await asyncio.sleep(TOKEN_VERSION_REFRESH_SECONDS)
+
+def token_claims(user: dict) -> dict:
+    """Build the JWT claims for a user; stateless mode adds role, status, name and token version"""
+    claims = {"sub": str(user["_id"])}
+    if AUTH_STATELESS_CLAIMS:
+        claims.update({
+            "role": user["role"],
+            "status": user["status"],
+            "name": user["full_name"],
+            "ver": user.get("token_version", 0)
+        })
+    return claims
+
+def create_access_token(data: dict) -> str:
+    to_encode = data.copy()
+    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire})
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+class VerifiedTokenCache:
+    """Bounded LRU of already verified tokens, keyed by SHA-256 of the token.
+
+    Only successfully verified tokens are stored, each alongside its `exp`, so an
+    entry is dropped the first time it is looked up past expiry.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        exp, payload = entry
+        if exp <= time.time():
+            del self._entries[key]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(payload)
+
+    def put(self, token: str, payload: dict):
+        exp = payload.get("exp")
+        if self.max_size <= 0 or not isinstance(exp, (int, float)):
+            return
+        self._entries[self._key(token)] = (exp, dict(payload))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expired": self.expired
+        }
+
+verified_tokens = VerifiedTokenCache(TOKEN_CACHE_MAX_SIZE)
+
+def decode_token(token: str) -> dict:
+    payload = verified_tokens.get(token)
+    if payload is not None:
+        return payload
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    verified_tokens.put(token, payload)
+    return payload
+
+def is_email(value: str) -> bool:
+    """Check if the string is an email address"""
+    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    return bool(re.match(email_pattern, value))
+
+async def load_user_from_payload(payload: dict) -> dict:
+    user_id = payload.get("sub")
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    
+    user = principal_cache.get(user_id)
+    if user is None:
+        user = await db.users.find_one({"_id": ObjectId(user_id)})
+        if not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        principal_cache.set(user_id, user)
+    
+    # Check if user is disabled
+    if user.get("status") == UserStatus.DISABLED:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Account is disabled")
+    
+    return user
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    return await load_user_from_payload(decode_token(credentials.credentials))
+
+async def get_current_principal(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Authorize from token claims when they are current, otherwise from the user document"""
+    payload = decode_token(credentials.credentials)
+    user_id = payload.get("sub")
+    if AUTH_STATELESS_CLAIMS and user_id and "ver" in payload and not token_versions.is_stale(user_id, payload["ver"]):
+        if payload["status"] == UserStatus.DISABLED:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Account is disabled")
+        return {
+            "_id": ObjectId(user_id),
+            "full_name": payload["name"],
+            "role": payload["role"],
+            "status": payload["status"],
+            "token_version": payload["ver"]
+        }
+    return await load_user_from_payload(payload)
+
+async def user_access_changed(user_id: str, user: Optional[dict] = None):
+    """Drop the cached principal and outdate claims tokens after a role/status change or delete"""
+    await users_access_changed([(user_id, user)])
+
+async def users_access_changed(changes: List[tuple]):
+    """Batch form of user_access_changed for (user_id, updated user or None if deleted) pairs"""
+    for user_id, _ in changes:
+        principal_cache.invalidate(user_id)
+    if not AUTH_STATELESS_CLAIMS or not changes:
+        return
+    expire_at = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    operations = []
+    for user_id, user in changes:
+        min_version = user.get("token_version", 0) if user else TOKEN_VERSION_DELETED
+        token_versions.record(user_id, min_version, expire_at)
+        operations.append(UpdateOne(
+            {"_id": user_id},
+            {"$max": {"min_version": min_version}, "$set": {"expire_at": expire_at}},
+            upsert=True
+        ))
+    await db.token_revocations.bulk_write(operations, ordered=False)
+
+async def require_admin(current_user: dict = Depends(get_current_principal)):
+    if current_user["role"] not in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
+async def require_approved_member(current_user: dict = Depends(get_current_principal)):
+    if current_user["status"] != UserStatus.APPROVED:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Membership not approved")
+    return current_user
+
+def admin_activity(admin_id: str, admin_name: str, action: str, target_type: str, target_id: str, details: Dict[str, Any]) -> dict:
+    return {
+        "admin_id": admin_id,
+        "admin_name": admin_name,
+        "action": action,
+        "target_type": target_type,
+        "target_id": target_id,
+        "details": details,
+        "timestamp": datetime.utcnow()
+    }
+
+def activity_to_response(activity: dict) -> AdminActivityResponse:
+    return AdminActivityResponse(
+        id=str(activity["_id"]),
+        admin_id=activity["admin_id"],
+        admin_name=activity["admin_name"],
+        action=activity["action"],
+        target_type=activity["target_type"],
+        target_id=activity["target_id"],
+        details=activity["details"],
+        timestamp=activity["timestamp"].isoformat()
+    )
+
+async def log_admin_activity(admin_id: str, admin_name: str, action: str, target_type: str, target_id: str, details: Dict[str, Any]):
+    """Log admin activities for audit trail - audit_writer stores them in the background"""
+    activity = admin_activity(admin_id, admin_name, action, target_type, target_id, details)
+    audit_writer.append(activity)
+    event_bus.publish("activity", activity_to_response(activity).dict())
+    logger.info(f"Admin activity logged: {action} on {target_type} by {admin_name}")
+
+async def log_admin_activities(activities: List[dict]):
+    """Log a batch of admin activities"""
+    if not activities:
+        return
+    for activity in activities:
+        audit_writer.append(activity)
+        event_bus.publish("activity", activity_to_response(activity).dict())
+    logger.info(f"Admin activities logged: {len(activities)} x {activities[0]['action']} by {activities[0]['admin_name']}")
+
+def user_to_response(user: dict) -> UserResponse:
+    return UserResponse(
+        id=str(user["_id"]),
+        username=user.get("username"),
+        email=user["email"],
+        full_name=user["full_name"],
+        phone=user.get("phone") or DEFAULT_PHONE,
+        address=user["address"],
+        institution=user["institution"],
+        committee=user["committee"],
+        position=user.get("position"),
+        blood_group=user.get("blood_group"),
+        photo=user.get("photo"),
+        role=user["role"],
+        status=user["status"],
+        membership_id=user.get("membership_id"),
+        issue_date=user.get("issue_date"),
+        created_at=user["created_at"].isoformat() if isinstance(user["created_at"], datetime) else user["created_at"]
+    )
+
+# ========== ATOMIC UPDATES ==========
+
+async def update_one_and_fetch(collection, object_id: ObjectId, update: dict, preconditions: Optional[dict] = None,
+                               not_found_detail: str = "User not found",
+                               precondition_detail: str = "Operation not permitted",
+                               precondition_status: int = status.HTTP_403_FORBIDDEN,
+                               return_document: ReturnDocument = ReturnDocument.AFTER,
+                               track_user_stats: bool = False) -> dict:
+    """Apply `update` to one document and return its post-image in a single round trip.
+
+    `preconditions` are folded into the filter; only when nothing matches is the
+    document looked up again, to tell a missing document (404) from a failed
+    precondition (`precondition_status`, 403 by default). Pass
+    ReturnDocument.BEFORE to get the pre-image instead.
+    With `track_user_stats` the pre-image is fetched, the post-image derived from
+    it locally and the dashboard counters and membership rollups moved by the
+    difference.
+    """
+    document = await collection.find_one_and_update(
+        {"_id": object_id, **(preconditions or {})},
+        update,
+        return_document=ReturnDocument.BEFORE if track_user_stats else return_document
+    )
+    if document is None:
+        if preconditions and await collection.count_documents({"_id": object_id}, limit=1):
+            raise HTTPException(status_code=precondition_status, detail=precondition_detail)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found_detail)
+    if track_user_stats:
+        updated = apply_update(document, update)
+        await track_user_changes([(document, updated)])
+        return document if return_document == ReturnDocument.BEFORE else updated
+    return document
+
+def apply_update(document: dict, update: dict) -> dict:
+    """The post-image of a $set/$inc/$unset update, computed without asking the server"""
+    updated = dict(document)
+    updated.update(update.get("$set", {}))
+    for field, amount in update.get("$inc", {}).items():
+        updated[field] = updated.get(field, 0) + amount
+    for field in update.get("$unset", {}):
+        updated.pop(field, None)
+    return updated
+
+# ========== PAGINATION ==========
+
+def encode_cursor(doc: dict, field: str) -> str:
+    """Opaque cursor pointing just past `doc` in (field, _id) order"""
+    value = doc.get(field)
+    if isinstance(value, datetime):
+        position = {"d": value.isoformat(), "i": str(doc["_id"])}
+    else:
+        position = {"v": value, "i": str(doc["_id"])}
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+        value = datetime.fromisoformat(position["d"]) if "d" in position else position["v"]
+        return value, ObjectId(position["i"])
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def keyset_filter(query: dict, field: str, direction: int, cursor: Optional[str]) -> dict:
+    """Restrict `query` to documents after the cursor position"""
+    if not cursor:
+        return query
+    value, last_id = decode_cursor(cursor)
+    op = "$lt" if direction < 0 else "$gt"
+    # Documents missing `field` sort before every value and are ordered by _id alone;
+    # range operators never match them, so they are reached through an explicit null branch
+    if value is None:
+        after = {"$or": [{field: None, "_id": {op: last_id}}]}
+        if direction > 0:
+            after["$or"].append({field: {"$ne": None}})
+    else:
+        after = {"$or": [{field: {op: value}}, {field: value, "_id": {op: last_id}}]}
+        if direction < 0:
+            after["$or"].append({field: None})
+    return {"$and": [query, after]} if query else after
+
+async def fetch_page(collection, query: dict, field: str, direction: int, limit: int,
+                     cursor: Optional[str] = None, projection: Optional[dict] = None) -> tuple:
+    """Fetch one page ordered by (field, _id); returns (docs, next_cursor)"""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    docs = await collection.find(keyset_filter(query, field, direction, cursor), projection) \
+        .sort([(field, direction), ("_id", direction)]) \
+        .limit(limit + 1) \
+        .to_list(limit + 1)
+    next_cursor = encode_cursor(docs[limit - 1], field) if len(docs) > limit else None
+    return docs[:limit], next_cursor
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+# ========== CONDITIONAL RESPONSES ==========
+
+class CollectionVersions:
+    """Per-collection change counters for public list ETags.
+
+    Write handlers bump a collection after changing it, through `public_list_changed`
+    for lists that also sit in the response cache. The process epoch makes
+    ETags from before a restart (or from another worker) never match.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._versions: Dict[str, int] = {}
+        self.not_modified = 0
+
+    def get(self, collection: str) -> int:
+        return self._versions.get(collection, 0)
+
+    def bump(self, collection: str):
+        self._versions[collection] = self.get(collection) + 1
+
+    def etag(self, collection: str, request: Request) -> str:
+        """Strong ETag for one list response: collection version plus the exact URL queried"""
+        window = int(time.time() // PUBLIC_ETAG_MAX_AGE_SECONDS) if PUBLIC_ETAG_MAX_AGE_SECONDS > 0 else 0
+        variant = hashlib.sha1(f"{request.url.path}?{request.url.query}".encode()).hexdigest()[:12]
+        return f'"{collection}-{self.epoch}-{self.get(collection)}-{window}-{variant}"'
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"epoch": self.epoch, "versions": dict(self._versions), "not_modified": self.not_modified}
+
+collection_versions = CollectionVersions()
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+
+def conditional_list(collection: str, request: Request, response: Response) -> Optional[Response]:
+    """Tag a public list response; returns the 304 to send instead when the client is current.
+
+    Call before reading, so a write racing the read can only make the tag stale, never the body.
+    """
+    etag = collection_versions.etag(collection, request)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        collection_versions.not_modified += 1
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+# ========== INDEXES ==========
+
+DEFAULT_PHONE = "0000000000"
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Store the signup placeholder (or a blank) as null, so the unique phone index skips it"""
+    phone = (phone or "").strip()
+    return None if not phone or phone == DEFAULT_PHONE else phone
+
+class IndexSpec:
+    """Declarative description of an index the app relies on"""
+
+    def __init__(self, collection: str, keys: List[tuple], **options):
+        self.collection = collection
+        self.keys = keys
+        self.options = options
+        self.name = options.pop("name", None) or "_".join(f"{field}_{direction}" for field, direction in keys)
+
+    def describe(self) -> Dict[str, Any]:
+        return {"collection": self.collection, "name": self.name, "keys": self.keys, "options": self.options}
+
+INDEX_REGISTRY = [
+    IndexSpec("users", [("email", 1)], unique=True),
+    IndexSpec("users", [("username", 1)], unique=True, partialFilterExpression={"username": {"$type": "string"}}),
+    # Unknown phones are stored as null (see normalize_phone), so every real number, +977 forms included,
+    # is unique and indexed. Renamed from phone_1, whose $gt filter skipped numbers sorting below the placeholder
+    IndexSpec("users", [("phone", 1)], unique=True, partialFilterExpression={"phone": {"$type": "string"}}, name="phone_1_string"),
+    IndexSpec("users", [("membership_id", 1)], unique=True, partialFilterExpression={"membership_id": {"$type": "string"}}),
+    IndexSpec("users", [("created_at", -1), ("_id", -1)]),
+    IndexSpec("users", [("status", 1), ("created_at", -1), ("_id", -1)]),
+    IndexSpec("content", [("type", 1), ("created_at", -1), ("_id", -1)]),
+    IndexSpec("contacts", [("committee", 1), ("order", 1), ("_id", 1)]),
+    IndexSpec("contacts", [("order", 1), ("_id", 1)]),
+    IndexSpec("songs", [("created_at", 1), ("_id", 1)]),
+    IndexSpec("songs", [("category", 1), ("created_at", 1), ("_id", 1)]),
+    IndexSpec("otp_codes", [("phone", 1)], unique=True),
+    IndexSpec("otp_codes", [("expire_at", 1)], expireAfterSeconds=0),
+    IndexSpec("admin_activities", [("timestamp", -1)]),
+    IndexSpec("token_revocations", [("expire_at", 1)], expireAfterSeconds=0),
+    IndexSpec("song_uploads", [("expire_at", 1)], expireAfterSeconds=0),
+    IndexSpec("blobs", [("refs", 1), ("zero_since", 1)]),
+    IndexSpec("song_stats", [("day", 1), ("song_id", 1)]),
+    IndexSpec("play_stats_batches", [("expire_at", 1)], expireAfterSeconds=0),
+    IndexSpec("membership_rollups", [("day", 1), ("committee", 1)]),
+    IndexSpec("content", [("_seq", 1)]),
+    IndexSpec("contacts", [("_seq", 1)]),
+    IndexSpec("songs", [("_seq", 1)]),
+    IndexSpec("tombstones", [("_seq", 1)]),
+]
+
+# Query shapes issued by the routes, used to print explain() plans
+QUERY_SHAPES = [
+    {"route": "POST /api/auth/login (email)", "collection": "users", "filter": {"email": "admin@annfsu.org"}},
+    {"route": "POST /api/auth/login (username)", "collection": "users", "filter": {"username": "admin"}},
+    {"route": "POST /api/auth/request-otp", "collection": "users", "filter": {"phone": "9851234567"}},
+    {"route": "POST /api/auth/verify-otp", "collection": "otp_codes", "filter": {"phone": "9851234567", "otp": "000000", "used": False}},
+    {"route": "GET /api/admin/users", "collection": "users", "filter": {}, "sort": [("created_at", -1), ("_id", -1)]},
+    {"route": "GET /api/members?status_filter", "collection": "users", "filter": {"status": UserStatus.PENDING}, "sort": [("created_at", -1), ("_id", -1)]},
+    {"route": "GET /api/content/{content_type}", "collection": "content", "filter": {"type": "news"}, "sort": [("created_at", -1), ("_id", -1)]},
+    {"route": "GET /api/contacts?committee", "collection": "contacts", "filter": {"committee": "central"}, "sort": [("order", 1), ("_id", 1)]},
+    {"route": "GET /api/songs", "collection": "songs", "filter": {}, "sort": [("created_at", 1), ("_id", 1)]},
+    {"route": "GET /api/songs?category", "collection": "songs", "filter": {"category": "anthem"}, "sort": [("created_at", -1), ("_id", -1)]},
+    {"route": "GET /api/admin/activities", "collection": "admin_activities", "filter": {}, "sort": [("timestamp", -1)]},
+    {"route": "GET /api/admin/stats/timeseries", "collection": "membership_rollups", "filter": {"day": {"$gte": "2024-01-01"}}},
+]
+
+# Options that change index semantics; anything else (v, ns, background) is ignored when checking drift
+INDEX_COMPARED_OPTIONS = ("unique", "expireAfterSeconds", "partialFilterExpression", "sparse")
+
+index_report: Dict[str, Any] = {"status": "not_started", "created": [], "drifted": [], "failed": [], "unmanaged": []}
+
+def index_drift(spec: IndexSpec, existing: Dict[str, Any]) -> List[str]:
+    """List the differences between a spec and the live index of the same name"""
+    problems = []
+    if [tuple(key) for key in existing["key"]] != [tuple(key) for key in spec.keys]:
+        problems.append(f"keys {existing['key']} != {spec.keys}")
+    for option in INDEX_COMPARED_OPTIONS:
+        live = existing.get(option)
+        wanted = spec.options.get(option)
+        if live is False:
+            live = None
+        if wanted is False:
+            wanted = None
+        if live != wanted:
+            problems.append(f"{option} {live!r} != {wanted!r}")
+    return problems
+
+async def ensure_indexes() -> Dict[str, Any]:
+    """Create missing registry indexes and report any that drifted from their spec"""
+    report = {"status": "running", "created": [], "drifted": [], "failed": [], "unmanaged": []}
+    index_report.update(report)
+    specs_by_collection: Dict[str, List[IndexSpec]] = {}
+    for spec in INDEX_REGISTRY:
+        specs_by_collection.setdefault(spec.collection, []).append(spec)
+    
+    for collection_name, specs in specs_by_collection.items():
+        collection = db[collection_name]
+        try:
+            existing = await collection.index_information()
+        except Exception as e:
+            report["failed"].append({"collection": collection_name, "error": str(e)})
+            continue
+        
+        for spec in specs:
+            if spec.name in existing:
+                problems = index_drift(spec, existing[spec.name])
+                if problems:
+                    report["drifted"].append({**spec.describe(), "problems": problems})
+                    logger.warning(f"Index {collection_name}.{spec.name} drifted: {'; '.join(problems)}")
+                continue
+            try:
+                await collection.create_index(spec.keys, name=spec.name, background=True, **spec.options)
+                report["created"].append(spec.describe())
+                logger.info(f"Created index {collection_name}.{spec.name}")
+            except Exception as e:
+                report["failed"].append({**spec.describe(), "error": str(e)})
+                logger.error(f"Failed to create index {collection_name}.{spec.name}: {e}")
+        
+        managed = {spec.name for spec in specs} | {"_id_"}
+        for name in existing:
+            if name not in managed:
+                report["unmanaged"].append({"collection": collection_name, "name": name, "keys": existing[name]["key"]})
+    
+    report["status"] = "complete"
+    report["checked_at"] = datetime.utcnow().isoformat()
+    index_report.update(report)
+    return report
+
+def summarize_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a winning plan into its stage chain and the indexes it uses"""
+    stages = []
+    indexes = []
+    node = plan
+    while node:
+        stages.append(node.get("stage"))
+        if node.get("indexName"):
+            indexes.append(node["indexName"])
+        node = node.get("inputStage") or (node.get("inputStages") or [None])[0]
+    return {"stages": " > ".join(stage for stage in stages if stage), "indexes": indexes}
+
+async def explain_query_shapes() -> List[Dict[str, Any]]:
+    plans = []
+    for shape in QUERY_SHAPES:
+        cursor = db[shape["collection"]].find(shape["filter"])
+        if shape.get("sort"):
+            cursor = cursor.sort(shape["sort"])
+        explanation = await cursor.limit(50).explain()
+        planner = explanation.get("queryPlanner", {})
+        stats = explanation.get("executionStats", {})
+        plans.append({
+            "route": shape["route"],
+            "collection": shape["collection"],
+            "filter": shape["filter"],
+            "sort": shape.get("sort"),
+            "winning_plan": summarize_plan(planner.get("winningPlan", {})),
+            "docs_examined": stats.get("totalDocsExamined"),
+            "keys_examined": stats.get("totalKeysExamined"),
+            "returned": stats.get("nReturned")
+        })
+    return plans
+
+def duplicate_user_detail(error: DuplicateKeyError) -> str:
+    """Map a unique index violation on users to a user-facing message"""
+    key_pattern = (error.details or {}).get("keyPattern", {})
+    if "username" in key_pattern:
+        return "Username already taken"
+    if "phone" in key_pattern:
+        return "Phone number already registered"
+    return "Email already registered"
+
+# ========== MEMBERSHIP IDS ==========
+
+MEMBERSHIP_ID_PREFIX = "ANNFSU-"
+MEMBERSHIP_ID_COUNTER = "membership_id"
+# ANNFSU-00000 and ANNFSU-00001 are hard-coded by the seed endpoints
+MEMBERSHIP_ID_RESERVED = 1
+
+def format_membership_id(number: int) -> str:
+    return f"{MEMBERSHIP_ID_PREFIX}{number:05d}"
+
+async def next_sequence(name: str, count: int = 1) -> int:
+    """Atomically reserve `count` consecutive values of a named counter and return the first"""
+    counter = await db.counters.find_one_and_update(
+        {"_id": name},
+        {"$inc": {"seq": count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return counter["seq"] - count + 1
+
+async def allocate_membership_ids(count: int = 1) -> List[str]:
+    """Reserve a block of membership IDs in a single round trip"""
+    if count <= 0:
+        return []
+    first = await next_sequence(MEMBERSHIP_ID_COUNTER, count)
+    return [format_membership_id(number) for number in range(first, first + count)]
+
+async def check_approvable(object_id: ObjectId, not_found_detail: str = "User not found"):
+    """Refuse missing or already approved users before a membership ID is spent on them"""
+    user = await db.users.find_one({"_id": object_id}, {"status": 1})
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found_detail)
+    if user.get("status") == UserStatus.APPROVED:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Already approved")
+
+async def highest_issued_membership_number() -> int:
+    pipeline = [
+        {"$match": {"membership_id": {"$regex": f"^{MEMBERSHIP_ID_PREFIX}[0-9]+$"}}},
+        {"$group": {"_id": None, "highest": {"$max": {"$toInt": {"$substrCP": ["$membership_id", len(MEMBERSHIP_ID_PREFIX), 20]}}}}}
+    ]
+    result = await db.users.aggregate(pipeline).to_list(1)
+    return (result[0]["highest"] or 0) if result else 0
+
+async def sync_membership_counter():
+    """Start the counter past every membership ID issued before it existed"""
+    if await db.counters.find_one({"_id": MEMBERSHIP_ID_COUNTER}):
+        return
+    highest = max(await highest_issued_membership_number(), MEMBERSHIP_ID_RESERVED)
+    await db.counters.update_one({"_id": MEMBERSHIP_ID_COUNTER}, {"$max": {"seq": highest}}, upsert=True)
+    logger.info(f"Membership ID counter initialised at {highest}")
+
+async def find_membership_id_collisions() -> List[Dict[str, Any]]:
+    """Group users sharing a membership ID, earliest issued first"""
+    pipeline = [
+        {"$match": {"membership_id": {"$type": "string"}}},
+        {"$sort": {"issue_date": 1, "created_at": 1, "_id": 1}},
+        {"$group": {
+            "_id": "$membership_id",
+            "count": {"$sum": 1},
+            "users": {"$push": {"_id": "$_id", "full_name": "$full_name"}}
+        }},
+        {"$match": {"count": {"$gt": 1}}}
+    ]
+    return await db.users.aggregate(pipeline).to_list(None)
+
+# ========== CHANGE JOURNAL ==========
+
+CHANGE_SEQ_COUNTER = "change_seq"
+SYNCED_COLLECTIONS = ("content", "contacts", "songs")
+
+class ChangeJournal:
+    """Hands out change sequence numbers for synced writes and tracks which are still in flight.
+
+    A sequence number is reserved before the write it labels is applied, so a
+    higher number can become visible before a lower one. `watermark` is the
+    highest sequence below every write still in flight; sync never returns
+    changes above it, so a client's `since` never skips over a slow writer.
+    Writes in other worker processes are not tracked.
+    """
+
+    def __init__(self):
+        self._writes: Dict[object, List[float]] = {}
+        self._last_seen = 0
+        self.stalled = 0
+
+    @asynccontextmanager
+    async def write(self, count: int = 1):
+        """Reserve `count` sequence numbers for the enclosed write; yields the first"""
+        ticket = object()
+        # Anything reserved from here on is above what this process has already seen
+        self._writes[ticket] = [self._last_seen, time.monotonic()]
+        try:
+            first = await next_sequence(CHANGE_SEQ_COUNTER, count)
+            self._writes[ticket][0] = first - 1
+            self._last_seen = max(self._last_seen, first + count - 1)
+            yield first
+        finally:
+            del self._writes[ticket]
+
+    async def watermark(self) -> int:
+        counter = await db.counters.find_one({"_id": CHANGE_SEQ_COUNTER})
+        current = counter["seq"] if counter else 0
+        self._last_seen = max(self._last_seen, current)
+        horizon = time.monotonic() - SYNC_WRITE_TIMEOUT_SECONDS
+        floors = []
+        for floor, started_at in self._writes.values():
+            if started_at > horizon:
+                floors.append(floor)
+            else:
+                # A write this slow has most likely failed; don't hold every client back for it
+                self.stalled += 1
+        return min(floors + [current])
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"in_flight": len(self._writes), "last_seen": self._last_seen, "stalled": self.stalled}
+
+change_journal = ChangeJournal()
+
+async def record_deletions(collection: str, doc_ids: List[Any], first_seq: int):
+    """Leave tombstones so synced clients learn about deleted documents"""
+    if not doc_ids:
+        return
+    now = datetime.utcnow()
+    await db.tombstones.insert_many([
+        {"collection": collection, "doc_id": str(doc_id), "_seq": first_seq + offset, "deleted_at": now}
+        for offset, doc_id in enumerate(doc_ids)
+    ])
+
+async def clear_placeholder_phones():
+    """Null out placeholder phones stored before normalize_phone, which would collide in the unique phone index"""
+    result = await db.users.update_many({"phone": {"$in": [DEFAULT_PHONE, ""]}}, {"$set": {"phone": None}})
+    if result.modified_count:
+        logger.info(f"Cleared placeholder phone numbers on {result.modified_count} users")
+
+async def prepare_indexes():
+    try:
+        await clear_placeholder_phones()
+    except Exception as e:
+        logger.error(f"Placeholder phone cleanup failed: {e}")
+    await ensure_indexes()
+
+async def backfill_change_seq():
+    """Give documents written before the journal existed a sequence number"""
+    for name in SYNCED_COLLECTIONS:
+        doc_ids = [doc["_id"] async for doc in db[name].find({"_seq": {"$exists": False}}, {"_id": 1})]
+        if not doc_ids:
+            continue
+        async with change_journal.write(len(doc_ids)) as first_seq:
+            await db[name].bulk_write([
+                UpdateOne({"_id": doc_id, "_seq": {"$exists": False}}, {"$set": {"_seq": first_seq + offset}})
+                for offset, doc_id in enumerate(doc_ids)
+            ], ordered=False)
+        logger.info(f"Assigned change sequence numbers to {len(doc_ids)} {name} documents")
+
+# ========== EVENT BUS ==========
+
+class EventBus:
+    """In-process pub/sub feeding the live admin stream.
+
+    Every subscriber has a bounded queue and `publish` never waits. A subscriber
+    that falls behind has its backlog dropped and gets a single `resync` event
+    instead, telling the client to refetch rather than trust a feed with gaps.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: set = set()
+        self._seq = 0
+        self.published = 0
+        self.overflows = 0
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, kind: str, data: Any):
+        self._seq += 1
+        self.published += 1
+        event = (self._seq, kind, data)
+        for queue in self._subscribers:
+            if queue.full():
+                self.overflows += 1
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait((self._seq, "resync", {}))
+            queue.put_nowait(event)
+
+    def close(self):
+        """Wake every subscriber with an end-of-stream marker"""
+        for queue in self._subscribers:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "subscribers": self.subscriber_count,
+            "published": self.published,
+            "overflows": self.overflows,
+            "max_queued": max((queue.qsize() for queue in self._subscribers), default=0)
+        }
+
+event_bus = EventBus(ADMIN_STREAM_QUEUE_SIZE)
+
+def sse_event(seq: Optional[int], kind: str, data: Any) -> bytes:
+    lines = [f"id: {seq}"] if seq is not None else []
+    lines.append(f"event: {kind}")
+    lines.append("data: " + encode_json(jsonable_encoder(data)).decode("utf-8"))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+# ========== DASHBOARD STATS ==========
+
+DASHBOARD_STATS_ID = "dashboard"
+MEMBER_ROLES = [UserRole.MEMBER, UserRole.ADMIN, UserRole.SUPER_ADMIN]
+USER_STATUS_COUNTERS = {
+    UserStatus.PENDING: "pending_requests",
+    UserStatus.APPROVED: "approved_members",
+    UserStatus.REJECTED: "rejected_members"
+}
+COLLECTION_COUNTERS = {"content": "total_content", "songs": "total_songs", "contacts": "total_contacts"}
+DASHBOARD_COUNTERS = ["total_members", *USER_STATUS_COUNTERS.values(), *COLLECTION_COUNTERS.values()]
+STATS_DRIFT_CONFIRM_SECONDS = 1.0
+
+def user_stats_contribution(user: Optional[dict]) -> Dict[str, int]:
+    """The dashboard counters one user document counts towards"""
+    contribution = {}
+    if not user:
+        return contribution
+    if user.get("role") in MEMBER_ROLES:
+        contribution["total_members"] = 1
+    counter = USER_STATUS_COUNTERS.get(user.get("status"))
+    if counter:
+        contribution[counter] = 1
+    return contribution
+
+def user_stats_delta(before: Optional[dict], after: Optional[dict]) -> Dict[str, int]:
+    """Counter changes for a user going from `before` to `after`; None stands for no document"""
+    delta = dict(user_stats_contribution(after))
+    for counter, value in user_stats_contribution(before).items():
+        delta[counter] = delta.get(counter, 0) - value
+    return {counter: value for counter, value in delta.items() if value}
+
+async def count_dashboard_stats() -> Dict[str, int]:
+    """Recount every dashboard counter - one $facet pass over users plus a count per collection"""
+    facets = {"total_members": [{"$match": {"role": {"$in": MEMBER_ROLES}}}, {"$count": "n"}]}
+    for status_value, counter in USER_STATUS_COUNTERS.items():
+        facets[counter] = [{"$match": {"status": status_value}}, {"$count": "n"}]
+    user_counts, *collection_counts = await asyncio.gather(
+        db.users.aggregate([{"$facet": facets}]).to_list(1),
+        *(db[name].count_documents({}) for name in COLLECTION_COUNTERS)
+    )
+    counts = {counter: rows[0]["n"] if rows else 0 for counter, rows in user_counts[0].items()}
+    counts.update(zip(COLLECTION_COUNTERS.values(), collection_counts))
+    return counts
+
+class DashboardCounters:
+    """Dashboard counts materialized in one db.stats document and kept current with $inc.
+
+    Every handler that changes a count bumps it right after its own write, so the
+    dashboard is a single find_one instead of a count per figure. A crash between
+    a write and its bump, or a write made outside the API, leaves drift behind;
+    `reconcile` recounts and repairs it.
+    """
+
+    def __init__(self):
+        self.bumps = 0
+        self.bump_failures = 0
+        self.recounts = 0
+        self.repairs = 0
+        self.last_drift: Dict[str, int] = {}
+        self.last_reconciled_at: Optional[datetime] = None
+
+    async def bump(self, delta: Dict[str, int]):
+        delta = {counter: value for counter, value in delta.items() if value}
+        if not delta:
+            return
+        try:
+            # No upsert - until the document exists `get` builds it from a recount
+            await db.stats.update_one({"_id": DASHBOARD_STATS_ID}, {"$inc": delta})
+            self.bumps += 1
+            event_bus.publish("stats_delta", delta)
+        except Exception as e:
+            # The write itself went through; reconciliation will pick up the difference
+            self.bump_failures += 1
+            logger.warning(f"Dashboard stats update {delta} failed: {e}")
+
+    async def get(self) -> Dict[str, int]:
+        stats = await db.stats.find_one({"_id": DASHBOARD_STATS_ID})
+        if stats and all(counter in stats for counter in DASHBOARD_COUNTERS):
+            return {counter: stats[counter] for counter in DASHBOARD_COUNTERS}
+        counts = await self.recount()
+        await db.stats.update_one({"_id": DASHBOARD_STATS_ID}, {"$setOnInsert": counts}, upsert=True)
+        return counts
+
+    async def recount(self) -> Dict[str, int]:
+        self.recounts += 1
+        return await count_dashboard_stats()
+
+    async def drift(self) -> Dict[str, int]:
+        """How far each stored counter is from a fresh recount"""
+        counts = await self.recount()
+        stored = await db.stats.find_one({"_id": DASHBOARD_STATS_ID}) or {}
+        return {
+            counter: counts[counter] - stored.get(counter, 0)
+            for counter in DASHBOARD_COUNTERS
+            if counts[counter] != stored.get(counter, 0)
+        }
+
+    async def reconcile(self, repair: bool = True) -> Dict[str, Any]:
+        """Recount and, unless `repair` is off, correct counters that have drifted.
+
+        A write landing between the recount and the read of the stored document
+        looks like drift of one, so drift is measured twice and only what is the
+        same both times is corrected - with $inc, keeping bumps made meanwhile.
+        """
+        drift = await self.drift()
+        repaired = {}
+        if drift and repair:
+            await asyncio.sleep(STATS_DRIFT_CONFIRM_SECONDS)
+            confirmed = await self.drift()
+            repaired = {counter: value for counter, value in confirmed.items() if drift.get(counter) == value}
+            if repaired:
+                await db.stats.update_one({"_id": DASHBOARD_STATS_ID}, {"$inc": repaired}, upsert=True)
+                self.repairs += 1
+                event_bus.publish("stats_delta", repaired)
+        self.last_drift = drift
+        self.last_reconciled_at = datetime.utcnow()
+        return {"drift": drift, "repaired": repaired}
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "bumps": self.bumps,
+            "bump_failures": self.bump_failures,
+            "recounts": self.recounts,
+            "repairs": self.repairs,
+            "last_drift": self.last_drift,
+            "last_reconciled_at": self.last_reconciled_at.isoformat() if self.last_reconciled_at else None
+        }
+
+dashboard_counters = DashboardCounters()
+
+async def reconcile_stats_periodically():
+    while True:
+        await asyncio.sleep(STATS_RECONCILE_SECONDS)
+        try:
+            result = await dashboard_counters.reconcile()
+            if result["repaired"]:
+                logger.warning(f"Dashboard stats had drifted, repaired by {result['repaired']}")
+        except Exception as e:
+            logger.warning(f"Dashboard stats reconciliation failed: {e}")
+
+# ========== MEMBERSHIP ROLLUPS ==========
+
+ROLLUP_FIELDS = ("signups", "approvals", "rejections", "pending_delta")
+
+def rollup_day(value: Any) -> Optional[str]:
+    """YYYY-MM-DD for a stored datetime or ISO string"""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, str) and len(value) >= 10:
+        return value[:10]
+    return None
+
+def user_committee(user: dict) -> str:
+    return user.get("committee") or "unknown"
+
+def user_rollup_delta(before: Optional[dict], after: Optional[dict]) -> Dict[str, Dict[str, int]]:
+    """Rollup changes per committee for a user going from `before` to `after`; None stands for no document"""
+    delta: Dict[str, Dict[str, int]] = {}
+
+    def add(user: dict, field: str, value: int):
+        bucket = delta.setdefault(user_committee(user), {})
+        bucket[field] = bucket.get(field, 0) + value
+
+    before_status = before.get("status") if before else None
+    after_status = after.get("status") if after else None
+    if before is None and after is not None:
+        add(after, "signups", 1)
+    if after_status != before_status:
+        if after_status == UserStatus.APPROVED and before_status in (UserStatus.PENDING, UserStatus.REJECTED):
+            add(after, "approvals", 1)
+        elif after_status == UserStatus.REJECTED and before_status is not None:
+            add(after, "rejections", 1)
+    # Leaving and re-entering the backlog also moves a pending user to their new committee
+    if before_status == UserStatus.PENDING:
+        add(before, "pending_delta", -1)
+    if after_status == UserStatus.PENDING:
+        add(after, "pending_delta", 1)
+    return {
+        committee: {field: value for field, value in bucket.items() if value}
+        for committee, bucket in delta.items()
+        if any(bucket.values())
+    }
+
+def rollup_upsert(day: str, committee: str, counts: Dict[str, int]) -> UpdateOne:
+    return UpdateOne(
+        {"_id": f"{day}:{committee}"},
+        {"$inc": counts, "$setOnInsert": {"day": day, "committee": committee}},
+        upsert=True
+    )
+
+class MembershipRollups:
+    """Daily signup, approval, rejection and pending counts per committee in `db.membership_rollups`.
+
+    One document per (day, committee). Handlers record each user transition as
+    $inc deltas on today's bucket; `pending_delta` is the net change to the
+    pending backlog, so the backlog on any day is the running sum up to it.
+    `backfill` rebuilds every bucket from the users collection.
+    """
+
+    def __init__(self):
+        self.records = 0
+        self.record_failures = 0
+        self.backfills = 0
+        self.last_backfill: Dict[str, Any] = {}
+
+    async def record(self, changes: List[tuple]):
+        """Count (before, after) user pairs towards today's buckets"""
+        totals: Dict[str, Dict[str, int]] = {}
+        for before, after in changes:
+            for committee, counts in user_rollup_delta(before, after).items():
+                bucket = totals.setdefault(committee, {})
+                for field, value in counts.items():
+                    bucket[field] = bucket.get(field, 0) + value
+        if not totals:
+            return
+        day = datetime.utcnow().strftime("%Y-%m-%d")
+        try:
+            await db.membership_rollups.bulk_write(
+                [rollup_upsert(day, committee, counts) for committee, counts in totals.items()],
+                ordered=False
+            )
+            self.records += 1
+            event_bus.publish("rollup_delta", {"day": day, "committees": totals})
+        except Exception as e:
+            # The user write went through; the next backfill restores the bucket
+            self.record_failures += 1
+            logger.warning(f"Membership rollup update failed: {e}")
+
+    async def backfill(self) -> Dict[str, Any]:
+        """Rebuild every bucket from users.
+
+        History is reconstructed: a user signed up and joined the backlog on
+        created_at, was approved on issue_date and left the backlog then, or on
+        updated_at if rejected or disabled without one. Transitions recorded
+        while a backfill runs may be overwritten by it.
+        """
+        started_at = time.perf_counter()
+        buckets: Dict[tuple, Dict[str, int]] = {}
+
+        def add(day: Optional[str], user: dict, field: str, value: int):
+            if day:
+                bucket = buckets.setdefault((day, user_committee(user)), dict.fromkeys(ROLLUP_FIELDS, 0))
+                bucket[field] += value
+
+        projection = {"committee": 1, "status": 1, "created_at": 1, "issue_date": 1, "updated_at": 1}
+        async for user in db.users.find({}, projection):
+            created_day = rollup_day(user.get("created_at"))
+            add(created_day, user, "signups", 1)
+            add(created_day, user, "pending_delta", 1)
+            user_status = user.get("status")
+            if user_status == UserStatus.PENDING:
+                continue
+            left_day = rollup_day(user.get("issue_date")) or rollup_day(user.get("updated_at")) or created_day
+            add(left_day, user, "pending_delta", -1)
+            if user.get("issue_date"):
+                add(left_day, user, "approvals", 1)
+            elif user_status == UserStatus.REJECTED:
+                add(left_day, user, "rejections", 1)
+
+        bucket_ids = [f"{day}:{committee}" for day, committee in buckets]
+        if buckets:
+            await db.membership_rollups.bulk_write([
+                ReplaceOne({"_id": bucket_id}, {"day": day, "committee": committee, **counts}, upsert=True)
+                for bucket_id, ((day, committee), counts) in zip(bucket_ids, buckets.items())
+            ], ordered=False)
+        stale = await db.membership_rollups.delete_many({"_id": {"$nin": bucket_ids}})
+        self.backfills += 1
+        self.last_backfill = {
+            "buckets": len(bucket_ids),
+            "removed": stale.deleted_count,
+            "took_ms": round((time.perf_counter() - started_at) * 1000, 1),
+            "at": datetime.utcnow().isoformat()
+        }
+        return self.last_backfill
+
+    async def backfill_if_empty(self):
+        try:
+            if not await db.membership_rollups.count_documents({}, limit=1):
+                report = await self.backfill()
+                logger.info(f"Backfilled {report['buckets']} membership rollup buckets")
+        except Exception as e:
+            logger.warning(f"Membership rollup backfill failed: {e}")
+
+    async def series(self, days: List[str], committee: Optional[str] = None) -> Dict[str, Any]:
+        """Dense per-day series per committee over `days`, with the pending backlog carried in"""
+        match = {"committee": committee} if committee else {}
+        baseline_rows, rows = await asyncio.gather(
+            db.membership_rollups.aggregate([
+                {"$match": {**match, "day": {"$lt": days[0]}}},
+                {"$group": {"_id": "$committee", "pending": {"$sum": "$pending_delta"}}}
+            ]).to_list(None),
+            db.membership_rollups.find({**match, "day": {"$gte": days[0], "$lte": days[-1]}}).to_list(None)
+        )
+        backlog = {row["_id"]: row["pending"] for row in baseline_rows}
+        buckets = {(row["committee"], row["day"]): row for row in rows}
+        committees = sorted(set(backlog) | {row["committee"] for row in rows})
+
+        series = {}
+        total = [{"day": day, "signups": 0, "approvals": 0, "rejections": 0, "pending": 0} for day in days]
+        for name in committees:
+            pending = backlog.get(name, 0)
+            points = []
+            for index, day in enumerate(days):
+                row = buckets.get((name, day), {})
+                pending += row.get("pending_delta", 0)
+                point = {
+                    "day": day,
+                    "signups": row.get("signups", 0),
+                    "approvals": row.get("approvals", 0),
+                    "rejections": row.get("rejections", 0),
+                    "pending": pending
+                }
+                points.append(point)
+                for field in ("signups", "approvals", "rejections", "pending"):
+                    total[index][field] += point[field]
+            series[name] = points
+        return {"since": days[0], "until": days[-1], "committees": series, "total": total}
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "records": self.records,
+            "record_failures": self.record_failures,
+            "backfills": self.backfills,
+            "last_backfill": self.last_backfill
+        }
+
+membership_rollups = MembershipRollups()
+
+async def track_user_changes(changes: List[tuple]):
+    """Move the dashboard counters and membership rollups for (before, after) user pairs"""
+    delta: Dict[str, int] = {}
+    for before, after in changes:
+        for counter, value in user_stats_delta(before, after).items():
+            delta[counter] = delta.get(counter, 0) + value
+    await dashboard_counters.bump(delta)
+    await membership_rollups.record(changes)
+
+# ========== AUDIO STORE ==========
+
+class GridFSAudioStore:
+    """Song audio kept in the `audio` GridFS bucket of the app database"""
+
+    kind = "gridfs"
+
+    def __init__(self, database):
+        self.bucket = AsyncIOMotorGridFSBucket(database, bucket_name="audio")
+
+    async def put_bytes(self, data: bytes, filename: str, content_type: str) -> str:
+        file_id = await self.bucket.upload_from_stream(filename, data, metadata={"content_type": content_type})
+        return str(file_id)
+
+    async def put_file(self, path: Path, filename: str, content_type: str) -> str:
+        with open(path, "rb") as source:
+            file_id = await self.bucket.upload_from_stream(filename, source, metadata={"content_type": content_type})
+        return str(file_id)
+
+    async def iter_range(self, file_id: str, start: int, end: int):
+        """Yield bytes start..end (inclusive) in AUDIO_STREAM_CHUNK_SIZE pieces"""
+        grid_out = await self.bucket.open_download_stream(ObjectId(file_id))
+        grid_out.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await grid_out.read(min(AUDIO_STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+    async def delete(self, file_id: str):
+        await self.bucket.delete(ObjectId(file_id))
+
+async def iter_file_range(path: Path, start: int, end: int):
+    """Read bytes start..end (inclusive) of a file in AUDIO_STREAM_CHUNK_SIZE pieces off the event loop"""
+    async for chunk in iter_open_file(open(path, "rb"), start, end):
+        yield chunk
+
+async def iter_open_file(source: BinaryIO, start: int, end: int):
+    """iter_file_range over a file already opened; closes it when done"""
+    loop = asyncio.get_running_loop()
+    with source:
+        source.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await loop.run_in_executor(None, source.read, min(AUDIO_STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+class LocalAudioStore:
+    """Song audio kept as plain files, sharded by the first two characters of the id"""
+
+    kind = "local"
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def path(self, file_id: str) -> Path:
+        return self.root / file_id[:2] / file_id
+
+    def _new_path(self) -> tuple:
+        file_id = uuid.uuid4().hex
+        path = self.path(file_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return file_id, path
+
+    async def put_bytes(self, data: bytes, filename: str, content_type: str) -> str:
+        file_id, path = self._new_path()
+        await asyncio.get_running_loop().run_in_executor(None, path.write_bytes, data)
+        return file_id
+
+    async def put_file(self, path: Path, filename: str, content_type: str) -> str:
+        file_id, target = self._new_path()
+        await asyncio.get_running_loop().run_in_executor(None, shutil.copyfile, path, target)
+        return file_id
+
+    async def iter_range(self, file_id: str, start: int, end: int):
+        async for chunk in iter_file_range(self.path(file_id), start, end):
+            yield chunk
+
+    async def delete(self, file_id: str):
+        self.path(file_id).unlink(missing_ok=True)
+
+audio_store = LocalAudioStore(AUDIO_STORE_DIR) if AUDIO_STORE == "local" else GridFSAudioStore(db)
+audio_stores: Dict[str, Any] = {audio_store.kind: audio_store}
+
+def audio_store_for(kind: Optional[str]):
+    """The store audio was written to, which need not be the one new audio goes to (AUDIO_STORE may have changed)"""
+    kind = kind or audio_store.kind
+    if kind not in audio_stores:
+        audio_stores[kind] = LocalAudioStore(AUDIO_STORE_DIR) if kind == "local" else GridFSAudioStore(db)
+    return audio_stores[kind]
+
+def decode_audio_data(audio_data: str) -> tuple:
+    """Split a base64 string or data: URI into (bytes, content type)"""
+    content_type = "audio/mpeg"
+    payload = audio_data
+    if audio_data.startswith("data:"):
+        header, _, payload = audio_data.partition(",")
+        content_type = header[5:].split(";")[0] or content_type
+    try:
+        return base64.b64decode(payload), content_type
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid audio data")
+
+# ========== BLOBS ==========
+
+class BlobStore:
+    """Content-addressed, reference-counted layer over `audio_store`.
+
+    `db.blobs` holds one document per distinct SHA-256 with the store file it
+    lives in and a `refs` count. Uploading bytes that already exist only bumps
+    `refs`; releasing the last reference stamps `zero_since`, and the sweeper
+    deletes the file once the blob has stayed unreferenced for the grace period.
+    """
+
+    def __init__(self):
+        self.acquired = 0
+        self.deduplicated = 0
+        self.bytes_saved = 0
+        self.released = 0
+        self.swept = 0
+
+    async def _reference(self, sha256: str) -> Optional[dict]:
+        return await db.blobs.find_one_and_update(
+            {"_id": sha256},
+            {"$inc": {"refs": 1}, "$unset": {"zero_since": ""}},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def acquire(self, sha256: str, size: int, content_type: str, filename: str,
+                      data: Optional[bytes] = None, path: Optional[Path] = None) -> dict:
+        """Take a reference on the blob for `sha256`, writing `data` or `path` only if it is new"""
+        self.acquired += 1
+        blob = await self._reference(sha256)
+        if blob:
+            self.deduplicated += 1
+            self.bytes_saved += size
+            return blob
+        
+        if data is not None:
+            file_id = await audio_store.put_bytes(data, filename, content_type)
+        else:
+            file_id = await audio_store.put_file(path, filename, content_type)
+        try:
+            blob = await db.blobs.find_one_and_update(
+                {"_id": sha256},
+                {
+                    "$setOnInsert": {
+                        "store": audio_store.kind,
+                        "file_id": file_id,
+                        "size": size,
+                        "content_type": content_type,
+                        "created_at": datetime.utcnow()
+                    },
+                    "$inc": {"refs": 1},
+                    "$unset": {"zero_since": ""}
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # A concurrent upload of the same bytes inserted first
+            blob = await self._reference(sha256)
+        if blob["file_id"] != file_id:
+            await audio_store.delete(file_id)
+            self.deduplicated += 1
+            self.bytes_saved += size
+        return blob
+
+    async def retain(self, sha256: str) -> bool:
+        """Take another reference on a blob already stored; False if there is no such blob"""
+        return await self._reference(sha256) is not None
+
+    async def release(self, sha256: str):
+        """Drop one reference; the sweeper collects the blob once nothing refers to it"""
+        self.released += 1
+        blob = await db.blobs.find_one_and_update(
+            {"_id": sha256},
+            {"$inc": {"refs": -1}},
+            return_document=ReturnDocument.AFTER
+        )
+        if blob and blob["refs"] <= 0:
+            await db.blobs.update_one(
+                {"_id": sha256, "refs": {"$lte": 0}},
+                {"$set": {"zero_since": datetime.utcnow()}}
+            )
+
+    async def sweep(self) -> int:
+        """Delete blobs unreferenced for longer than the grace period"""
+        now = datetime.utcnow()
+        # Releases interrupted between the decrement and the stamp
+        await db.blobs.update_many(
+            {"refs": {"$lte": 0}, "zero_since": {"$exists": False}},
+            {"$set": {"zero_since": now}}
+        )
+        cutoff = now - timedelta(seconds=BLOB_SWEEP_GRACE_SECONDS)
+        candidates = [blob["_id"] async for blob in db.blobs.find({"refs": {"$lte": 0}, "zero_since": {"$lte": cutoff}}, {"_id": 1})]
+        swept = 0
+        for sha256 in candidates:
+            # Re-check atomically: an upload may have revived the blob since the scan
+            blob = await db.blobs.find_one_and_delete({"_id": sha256, "refs": {"$lte": 0}, "zero_since": {"$lte": cutoff}})
+            if blob:
+                await audio_store_for(blob.get("store")).delete(blob["file_id"])
+                swept += 1
+        self.swept += swept
+        return swept
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "acquired": self.acquired,
+            "deduplicated": self.deduplicated,
+            "dedup_rate": round(self.deduplicated / self.acquired, 4) if self.acquired else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "released": self.released,
+            "swept": self.swept
+        }
+
+blob_store = BlobStore()
+
+async def sweep_blobs_periodically():
+    while True:
+        await asyncio.sleep(BLOB_SWEEP_INTERVAL_SECONDS)
+        try:
+            swept = await blob_store.sweep()
+            if swept:
+                logger.info(f"Swept {swept} unreferenced blobs")
+        except Exception as e:
+            logger.warning(f"Blob sweep failed: {e}")
+
+def blob_audio_fields(blob: dict) -> Dict[str, Any]:
+    """The fields a song document keeps about its audio blob"""
+    return {
+        "audio_store": blob["store"],
+        "audio_file_id": blob["file_id"],
+        "audio_size": blob["size"],
+        "audio_content_type": blob["content_type"],
+        "audio_etag": blob["_id"],
+        "audio_blob": blob["_id"]
+    }
+
+async def store_audio(data: bytes, filename: str, content_type: str) -> Dict[str, Any]:
+    """Store audio as a blob and return the fields a song document keeps about it"""
+    sha256 = await asyncio.get_running_loop().run_in_executor(None, lambda: hashlib.sha256(data).hexdigest())
+    return blob_audio_fields(await blob_store.acquire(sha256, len(data), content_type, filename, data=data))
+
+async def store_audio_file(path: Path, size: int, sha256: str, filename: str, content_type: str) -> Dict[str, Any]:
+    """Streaming counterpart of store_audio for a staged upload already hashed by the caller"""
+    return blob_audio_fields(await blob_store.acquire(sha256, size, content_type, filename, path=path))
+
+async def release_audio(song: dict):
+    """Give up a song's hold on its stored audio"""
+    if song.get("audio_blob"):
+        await blob_store.release(song["audio_blob"])
+    elif song.get("audio_file_id"):
+        # Stored before blobs existed, so nothing else can share the file
+        await audio_store_for(song.get("audio_store")).delete(song["audio_file_id"])
+
+async def migrate_inline_audio(song: dict) -> Optional[dict]:
+    """Move one song's inline base64 audio_data into the audio store.
+
+    Returns the song as stored afterwards, or None if it was deleted meanwhile.
+    Losing a race with another migration just releases this call's reference.
+    """
+    loop = asyncio.get_running_loop()
+    audio, content_type = await loop.run_in_executor(None, decode_audio_data, song["audio_data"])
+    audio_fields = await store_audio(audio, song["title_ne"], content_type)
+    migrated = await db.songs.find_one_and_update(
+        {"_id": song["_id"], "audio_data": {"$exists": True}},
+        {"$set": audio_fields, "$unset": {"audio_data": ""}},
+        projection={"peaks": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if migrated:
+        return migrated
+    await blob_store.release(audio_fields["audio_blob"])
+    return await db.songs.find_one({"_id": song["_id"]}, {"peaks": 0})
+
+async def store_images(images: List[str]) -> List[str]:
+    """Replace inline data: URI images with blob URLs; other URLs are kept as given.
+
+    Every blob URL in the result holds its own reference, including ones passed
+    in already stored, so callers can release the images they replace wholesale.
+    """
+    stored = []
+    try:
+        for image in images:
+            if image.startswith(BLOB_URL_PREFIX):
+                if not await blob_store.retain(image[len(BLOB_URL_PREFIX):]):
+                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown image")
+                stored.append(image)
+                continue
+            if not image.startswith("data:"):
+                stored.append(image)
+                continue
+            header, _, payload = image.partition(",")
+            try:
+                data = base64.b64decode(payload)
+            except (binascii.Error, ValueError):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid image data")
+            content_type = header[5:].split(";")[0] or "application/octet-stream"
+            sha256 = hashlib.sha256(data).hexdigest()
+            await blob_store.acquire(sha256, len(data), content_type, sha256, data=data)
+            stored.append(BLOB_URL_PREFIX + sha256)
+    except Exception:
+        await release_images(stored)
+        raise
+    return stored
+
+async def release_images(images: List[str]):
+    for image in images:
+        if image.startswith(BLOB_URL_PREFIX):
+            await blob_store.release(image[len(BLOB_URL_PREFIX):])
+
+async def read_audio(song: dict) -> bytes:
+    """Whole audio payload of a song, stored or still inline"""
+    cached = audio_disk_cache.lookup(song["audio_etag"]) if song.get("audio_etag") else None
+    if cached:
+        with cached:
+            return await asyncio.get_running_loop().run_in_executor(None, cached.read)
+    if song.get("audio_file_id"):
+        store = audio_store_for(song.get("audio_store"))
+        return b"".join([chunk async for chunk in store.iter_range(song["audio_file_id"], 0, song["audio_size"] - 1)])
+    return (await asyncio.get_running_loop().run_in_executor(None, decode_audio_data, song["audio_data"]))[0]
+
+class AudioDiskCache:
+    """Size-bounded LRU of stored song audio as plain files on local disk.
+
+    Files are named by the audio's SHA-256, so an entry can never go stale; the
+    index is rebuilt from the directory at startup in mtime order. Misses are
+    filled in the background, and new uploads are prefetched. The index is per
+    process while the directory may be shared, so another worker's eviction or
+    an external cleanup can remove an indexed file; such entries are dropped
+    when found missing and the caller falls back to the audio store.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._filling: set = set()
+        self._tasks: set = set()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.fills = 0
+        self.prefetches = 0
+        self.evictions = 0
+        self.vanished = 0
+
+    def path(self, etag: str) -> Path:
+        return self.root / etag[:2] / etag
+
+    def load(self):
+        if self.max_bytes <= 0 or not self.root.exists():
+            return
+        files = sorted((entry.stat().st_mtime, entry) for entry in self.root.glob("*/*") if entry.is_file())
+        for _, entry in files:
+            if entry.suffix == ".tmp":
+                entry.unlink(missing_ok=True)
+                continue
+            size = entry.stat().st_size
+            self._entries[entry.name] = size
+            self.total_bytes += size
+        self._evict()
+
+    def lookup(self, etag: str) -> Optional[BinaryIO]:
+        """The cached file opened for reading, if any, without touching the hit statistics.
+
+        An open handle keeps reading even if the file is evicted afterwards.
+        """
+        if etag not in self._entries:
+            return None
+        try:
+            cached = open(self.path(etag), "rb")
+        except FileNotFoundError:
+            self.total_bytes -= self._entries.pop(etag)
+            self.vanished += 1
+            return None
+        self._entries.move_to_end(etag)
+        return cached
+
+    def get(self, etag: str) -> Optional[BinaryIO]:
+        """The cached file opened for a play, counting a hit or a miss"""
+        cached = self.lookup(etag)
+        if cached:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return cached
+
+    def schedule_fill(self, song: dict, prefetch: bool = False):
+        """Copy a stored song's audio into the cache in the background"""
+        etag = song.get("audio_etag")
+        if self.max_bytes <= 0 or not song.get("audio_file_id") or not etag or song["audio_size"] > self.max_bytes:
+            return
+        if etag in self._entries or etag in self._filling:
+            return
+        if prefetch:
+            self.prefetches += 1
+        self._filling.add(etag)
+        task = asyncio.create_task(self._fill(etag, audio_store_for(song.get("audio_store")), song["audio_file_id"], song["audio_size"]))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fill(self, etag: str, store, file_id: str, size: int):
+        loop = asyncio.get_running_loop()
+        target = self.path(etag)
+        temp = target.with_suffix(".tmp")
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp, "wb") as cached:
+                async for chunk in store.iter_range(file_id, 0, size - 1):
+                    await loop.run_in_executor(None, cached.write, chunk)
+            os.replace(temp, target)
+            self._entries[etag] = size
+            self.total_bytes += size
+            self.fills += 1
+            self._evict()
+        except Exception as e:
+            temp.unlink(missing_ok=True)
+            logger.warning(f"Audio cache fill for {etag} failed: {e}")
+        finally:
+            self._filling.discard(etag)
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._entries:
+            etag, size = self._entries.popitem(last=False)
+            self.path(etag).unlink(missing_ok=True)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "files": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "fills": self.fills,
+            "prefetches": self.prefetches,
+            "evictions": self.evictions,
+            "vanished": self.vanished
+        }
+
+audio_disk_cache = AudioDiskCache(AUDIO_DISK_CACHE_DIR, AUDIO_DISK_CACHE_MAX_BYTES)
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[tuple]:
+    """Parse a single `bytes=` range into inclusive (start, end); None means send the whole body"""
+    if not range_header:
+        return None
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start = max(size - int(last), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, min(end, size - 1)
+
+async def iter_bytes(data: bytes, start: int, end: int):
+    for offset in range(start, end + 1, AUDIO_STREAM_CHUNK_SIZE):
+        yield data[offset:min(offset + AUDIO_STREAM_CHUNK_SIZE, end + 1)]
+
+# ========== SONG UPLOADS ==========
+
+class SongUploadSessions:
+    """Resumable upload bookkeeping: staged files on disk, running SHA-256 per upload.
+
+    The session document in `db.song_uploads` is the source of truth for the
+    committed offset; the in-process hasher is rebuilt from the staged file if
+    another worker (or a restart) handled the previous chunk.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._hashers: Dict[str, tuple] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def path(self, upload_id: str) -> Path:
+        return self.root / f"{upload_id}.part"
+
+    def lock(self, upload_id: str) -> asyncio.Lock:
+        return self._locks.setdefault(upload_id, asyncio.Lock())
+
+    async def hasher_at(self, upload_id: str, offset: int):
+        """SHA-256 state covering the first `offset` staged bytes"""
+        cached = self._hashers.get(upload_id)
+        if cached and cached[0] == offset:
+            return cached[1].copy()
+        
+        def rehash():
+            hasher = hashlib.sha256()
+            with open(self.path(upload_id), "rb") as staged:
+                remaining = offset
+                while remaining > 0:
+                    block = staged.read(min(AUDIO_STREAM_CHUNK_SIZE, remaining))
+                    if not block:
+                        break
+                    hasher.update(block)
+                    remaining -= len(block)
+            return hasher
+        
+        if offset == 0:
+            return hashlib.sha256()
+        return await asyncio.get_running_loop().run_in_executor(None, rehash)
+
+    def commit(self, upload_id: str, offset: int, hasher):
+        self._hashers[upload_id] = (offset, hasher)
+
+    def discard(self, upload_id: str):
+        self._hashers.pop(upload_id, None)
+        self._locks.pop(upload_id, None)
+        self.path(upload_id).unlink(missing_ok=True)
+
+song_uploads = SongUploadSessions(SONG_UPLOAD_DIR)
+
+def upload_status(session: dict) -> SongUploadStatus:
+    return SongUploadStatus(
+        upload_id=session["_id"],
+        offset=session["offset"],
+        total_size=session["total_size"],
+        max_chunk_size=SONG_UPLOAD_MAX_CHUNK
+    )
+
+async def get_upload_session(upload_id: str) -> dict:
+    session = await db.song_uploads.find_one({"_id": upload_id})
+    if not session:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+    return session
+
+async def write_upload_chunk(upload_id: str, offset: int, chunks, hasher) -> int:
+    """Write a streamed chunk at `offset`, hashing as it goes; returns bytes written"""
+    loop = asyncio.get_running_loop()
+    path = song_uploads.path(upload_id)
+    written = 0
+    with open(path, "r+b" if path.exists() else "w+b") as staged:
+        # Drop bytes of an earlier attempt that never committed
+        await loop.run_in_executor(None, staged.truncate, offset)
+        staged.seek(offset)
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            written += len(chunk)
+            if written > SONG_UPLOAD_MAX_CHUNK:
+                raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Chunk too large")
+            await loop.run_in_executor(None, staged.write, chunk)
+            hasher.update(chunk)
+    return written
+
+async def cleanup_stale_uploads():
+    """Remove staged files whose session expired"""
+    if not SONG_UPLOAD_DIR.exists():
+        return
+    live = {session["_id"] async for session in db.song_uploads.find({}, {"_id": 1})}
+    for staged in SONG_UPLOAD_DIR.glob("*.part"):
+        if staged.stem not in live:
+            song_uploads.discard(staged.stem)
+
+async def cleanup_stale_uploads_periodically():
+    while True:
+        try:
+            await cleanup_stale_uploads()
+        except Exception as e:
+            logger.warning(f"Stale upload cleanup failed: {e}")
+        await asyncio.sleep(3600)
+
+# ========== REQUEST COALESCING ==========
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one in-flight call.
+
+    The first caller starts the call as its own task; everyone arriving while
+    it runs awaits the same task, so a client disconnecting cannot cancel the
+    read for the others. Keys must capture everything the result depends on.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[tuple, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced: Dict[str, int] = {}
+
+    async def do(self, key: tuple, func):
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced[key[0]] = self.coalesced.get(key[0], 0) + 1
+        return await asyncio.shield(task)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": sum(self.coalesced.values()),
+            "coalesced_by_collection": dict(self.coalesced),
+            "in_flight": len(self._in_flight)
+        }
+
+single_flight = SingleFlight()
+
+# ========== SONG CATALOG ==========
+
+# Listing fields only - never the inline audio_data payload or analysis data
+SONG_LIST_PROJECTION = {"title_ne": 1, "category": 1, "duration": 1, "uploaded_by": 1, "created_at": 1}
+SONG_SORTS = {"created_at": 1, "-created_at": -1}
+
+def song_to_response(song: dict) -> SongResponse:
+    return SongResponse(
+        id=str(song["_id"]),
+        title_ne=song["title_ne"],
+        category=song["category"],
+        duration=song.get("duration", "00:00"),
+        uploaded_by=song["uploaded_by"],
+        created_at=song["created_at"].isoformat() if isinstance(song["created_at"], datetime) else song["created_at"]
+    )
+
+class SongCatalog:
+    """Versioned snapshot of song listing pages.
+
+    Every page is stored with the songs collection version it was read under;
+    creating or deleting a song bumps the version, which drops the snapshot and stops a read
+    that raced the write from caching its stale result. Per process - the TTL
+    bounds staleness when another worker changes the catalog.
+    """
+
+    def __init__(self, ttl_seconds: float, max_pages: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_pages = max_pages
+        self._pages: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._ids: Optional[tuple] = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def version(self) -> int:
+        return collection_versions.get("songs")
+
+    async def contains(self, song_id: str) -> bool:
+        """Whether a song exists, from a snapshot of the catalog's ids.
+
+        An id missing from the snapshot is checked against the database, since
+        another worker may have added the song since the snapshot was taken.
+        """
+        if self._ids and self._ids[0] == self.version and self._ids[1] > time.monotonic():
+            known = self._ids[2]
+        else:
+            version = self.version
+            ids = await single_flight.do(("songs", version, "ids"), lambda: db.songs.distinct("_id"))
+            known = frozenset(str(known_id) for known_id in ids)
+            if version == self.version and self.ttl_seconds > 0:
+                self._ids = (version, time.monotonic() + self.ttl_seconds, known)
+        if song_id in known:
+            return True
+        return await db.songs.find_one({"_id": ObjectId(song_id)}, {"_id": 1}) is not None
+
+    async def page(self, category: Optional[str], sort: str, limit: int, cursor: Optional[str]) -> tuple:
+        """(songs, next_cursor) for one listing page, from the snapshot when current"""
+        key = (category, sort, limit, cursor)
+        entry = self._pages.get(key)
+        if entry and entry[0] == self.version and entry[1] > time.monotonic():
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return entry[2], entry[3]
+        
+        self.misses += 1
+        version = self.version
+        query = {"category": category} if category else {}
+        
+        async def read():
+            songs, next_cursor = await fetch_page(db.songs, query, "created_at", SONG_SORTS[sort], limit, cursor, SONG_LIST_PROJECTION)
+            return [song_to_response(song) for song in songs], next_cursor
+        
+        # The version is part of the key so a read after a write never joins a read from before it
+        songs, next_cursor = await single_flight.do(("songs", version) + key, read)
+        if version == self.version and self.ttl_seconds > 0 and self.max_pages > 0:
+            self._pages[key] = (version, time.monotonic() + self.ttl_seconds, songs, next_cursor)
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return songs, next_cursor
+
+    def invalidate(self):
+        collection_versions.bump("songs")
+        self._pages.clear()
+        self._ids = None
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version,
+            "pages": len(self._pages),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+song_catalog = SongCatalog(SONG_CATALOG_TTL_SECONDS, SONG_CATALOG_MAX_PAGES)
+
+# ========== PUBLIC RESPONSE CACHE ==========
+
+def content_to_response(content: dict) -> ContentResponse:
+    return ContentResponse(
+        id=str(content["_id"]),
+        type=content["type"],
+        title_ne=content["title_ne"],
+        content_ne=content["content_ne"],
+        images=content.get("images", []),
+        author_id=content["author_id"],
+        created_at=content["created_at"].isoformat() if isinstance(content["created_at"], datetime) else content["created_at"],
+        updated_at=content["updated_at"].isoformat() if isinstance(content["updated_at"], datetime) else content["updated_at"]
+    )
+
+def contact_to_response(contact: dict) -> ContactResponse:
+    return ContactResponse(
+        id=str(contact["_id"]),
+        name_ne=contact["name_ne"],
+        designation_ne=contact["designation_ne"],
+        phone_number=contact["phone_number"],
+        committee=contact["committee"],
+        order=contact.get("order", 0),
+        created_at=contact["created_at"].isoformat() if isinstance(contact["created_at"], datetime) else contact["created_at"]
+    )
+
+# Computed by MongoDB (4.4+ find projection), so full bodies and image lists never leave the server
+CONTENT_SUMMARY_PROJECTION = {
+    "type": 1,
+    "title_ne": 1,
+    "author_id": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "excerpt": {"$substrCP": [{"$ifNull": ["$content_ne", ""]}, 0, CONTENT_EXCERPT_LENGTH]},
+    "image": {"$arrayElemAt": [{"$ifNull": ["$images", []]}, 0]}
+}
+
+def content_to_summary(content: dict) -> ContentSummary:
+    image = content.get("image")
+    return ContentSummary(
+        id=str(content["_id"]),
+        type=content["type"],
+        title_ne=content["title_ne"],
+        excerpt=content.get("excerpt", ""),
+        # Inline data: URIs predate blob storage and would defeat the point of a summary
+        image=image if image and not image.startswith("data:") else None,
+        author_id=content["author_id"],
+        created_at=content["created_at"].isoformat() if isinstance(content["created_at"], datetime) else content["created_at"],
+        updated_at=content["updated_at"].isoformat() if isinstance(content["updated_at"], datetime) else content["updated_at"]
+    )
+
+def encode_json(data: Any) -> bytes:
+    """Same encoding FastAPI's JSONResponse produces"""
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def raw_json_response(body: bytes, response: Response) -> Response:
+    """Send pre-encoded JSON, keeping headers already set on the injected response"""
+    return Response(content=body, media_type="application/json", headers=dict(response.headers))
+
+async def render_content_page(content_type: str, limit: int, cursor: Optional[str]) -> tuple:
+    contents, next_cursor = await fetch_page(db.content, {"type": content_type}, "created_at", -1, limit, cursor)
+    return encode_json([content_to_response(content).dict() for content in contents]), next_cursor
+
+async def render_content_summary_page(content_type: str, limit: int, cursor: Optional[str]) -> tuple:
+    contents, next_cursor = await fetch_page(db.content, {"type": content_type}, "created_at", -1, limit, cursor, CONTENT_SUMMARY_PROJECTION)
+    return encode_json([content_to_summary(content).dict() for content in contents]), next_cursor
+
+async def render_contacts_page(committee: Optional[str], limit: int, cursor: Optional[str]) -> tuple:
+    query = {"committee": committee} if committee else {}
+    contacts, next_cursor = await fetch_page(db.contacts, query, "order", 1, limit, cursor)
+    return encode_json([contact_to_response(contact).dict() for contact in contacts]), next_cursor
+
+class PublicResponseCache:
+    """Encoded JSON bytes of public list pages, keyed by (collection, group, limit, cursor).
+
+    A group is a content type or a contacts committee (None for all contacts).
+    Writers call `refresh`, which bumps the group's generation and re-renders
+    its first page write-through; a read that started under an older
+    generation never stores its result. Per process - the TTL bounds staleness
+    when another worker writes.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, renderers: Dict[str, Any]):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.renderers = renderers
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._generations: Dict[tuple, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def _generation(self, collection: str, group: Optional[str]) -> int:
+        return self._generations.setdefault((collection, group), 0)
+
+    async def _render(self, key: tuple) -> tuple:
+        collection, group, limit, cursor = key
+        generation = self._generation(collection, group)
+        body, next_cursor = await single_flight.do(
+            key + (generation,),
+            lambda: self.renderers[collection](group, limit, cursor)
+        )
+        if generation == self._generation(collection, group) and self.ttl_seconds > 0 and self.max_entries > 0:
+            self._entries[key] = (generation, time.monotonic() + self.ttl_seconds, body, next_cursor)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body, next_cursor
+
+    async def page(self, collection: str, group: Optional[str], limit: int, cursor: Optional[str]) -> tuple:
+        """(encoded body, next_cursor) for one list page"""
+        key = (collection, group, limit, cursor)
+        entry = self._entries.get(key)
+        if entry and entry[0] == self._generation(collection, group) and entry[1] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2], entry[3]
+        self.misses += 1
+        return await self._render(key)
+
+    def invalidate(self, collection: str, groups: Optional[List[Optional[str]]] = None):
+        """Bump the generation of `groups`, or of every group of the collection"""
+        if groups is None:
+            groups = [group for name, group in self._generations if name == collection]
+        for group in groups:
+            self._generations[(collection, group)] = self._generation(collection, group) + 1
+
+    async def refresh(self, collection: str, groups: List[Optional[str]]):
+        """Write-through after a change: invalidate `groups` and re-render their first page"""
+        self.invalidate(collection, groups)
+        for group in groups:
+            try:
+                await self._render((collection, group, DEFAULT_PAGE_SIZE, None))
+                self.refreshes += 1
+            except Exception as e:
+                logger.warning(f"Public cache refresh of {collection}/{group} failed: {e}")
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": sum(len(entry[2]) for entry in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "refreshes": self.refreshes
+        }
+
+public_cache = PublicResponseCache(
+    PUBLIC_CACHE_TTL_SECONDS,
+    PUBLIC_CACHE_MAX_ENTRIES,
+    {"content": render_content_page, "content_summary": render_content_summary_page, "contacts": render_contacts_page}
+)
+
+# Public list version -> the response cache collections serving it
+PUBLIC_LIST_CACHES = {"content": ["content", "content_summary"], "contacts": ["contacts"]}
+
+def public_list_changed(collection: str, groups: Optional[List[Optional[str]]] = None):
+    """Bump the list's ETag version and drop its cached pages in one step.
+
+    Nothing awaits in between, so no read can pair the new ETag with an old body.
+    Call right after the write, before any other await.
+    """
+    collection_versions.bump(collection)
+    for cached in PUBLIC_LIST_CACHES[collection]:
+        public_cache.invalidate(cached, groups)
+
+async def refresh_content_cache(content_type: str):
+    await public_cache.refresh("content", [content_type])
+    await public_cache.refresh("content_summary", [content_type])
+
+# ========== AUDIO ANALYSIS ==========
+
+# MPEG audio bitrates in kbps by (MPEG-1, layer) - index 0 is "free format", unsupported
+MP3_BITRATES = {
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+# Sample rates by version bits: 3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5
+MP3_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+def decode_wav(data: bytes) -> tuple:
+    """PCM/float WAV into (float32 frames x channels array, sample rate)"""
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("Not a WAV file")
+    pos = 12
+    fmt = None
+    payload = None
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        size = int.from_bytes(data[pos + 4:pos + 8], "little")
+        body = data[pos + 8:pos + 8 + size]
+        if chunk_id == b"fmt ":
+            format_tag, channels, sample_rate = struct.unpack("<HHI", body[:8])
+            bits = struct.unpack("<H", body[14:16])[0]
+            if format_tag == 0xFFFE and len(body) >= 26:
+                format_tag = struct.unpack("<H", body[24:26])[0]
+            fmt = (format_tag, channels, sample_rate, bits)
+        elif chunk_id == b"data":
+            payload = body
+            break
+        pos += 8 + size + (size & 1)
+    if fmt is None or payload is None:
+        raise ValueError("WAV file without fmt or data chunk")
+    
+    format_tag, channels, sample_rate, bits = fmt
+    width = bits // 8
+    if channels < 1 or sample_rate < 1 or width < 1:
+        raise ValueError("Invalid WAV format")
+    payload = payload[:len(payload) - len(payload) % (width * channels)]
+    if format_tag == 3 and bits in (32, 64):
+        samples = np.frombuffer(payload, dtype="<f4" if bits == 32 else "<f8").astype(np.float32)
+    elif format_tag == 1 and bits == 8:
+        samples = (np.frombuffer(payload, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif format_tag == 1 and bits == 16:
+        samples = np.frombuffer(payload, dtype="<i2").astype(np.float32) / 32768
+    elif format_tag == 1 and bits == 24:
+        raw = np.frombuffer(payload, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = ((raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)) << 8 >> 8).astype(np.float32) / 8388608
+    elif format_tag == 1 and bits == 32:
+        samples = np.frombuffer(payload, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported WAV encoding (format {format_tag}, {bits} bits)")
+    return samples.reshape(-1, channels), sample_rate
+
+def scan_mp3_frames(data: bytes) -> Dict[str, Any]:
+    """Walk MPEG audio frame headers for duration - the audio itself is not decoded"""
+    pos = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        tag_size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+        pos = 10 + tag_size + (10 if data[5] & 0x10 else 0)
+    
+    frames = 0
+    total_samples = 0
+    total_bytes = 0
+    sample_rate = None
+    channels = None
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+            next_sync = data.find(b"\xff", pos + 1)
+            if next_sync < 0:
+                break
+            pos = next_sync
+            continue
+        version_bits = (data[pos + 1] >> 3) & 3
+        layer = 4 - ((data[pos + 1] >> 1) & 3)
+        bitrate_index = data[pos + 2] >> 4
+        rate_index = (data[pos + 2] >> 2) & 3
+        if version_bits == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+            pos += 1
+            continue
+        mpeg1 = version_bits == 3
+        bitrate = MP3_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+        rate = MP3_SAMPLE_RATES[version_bits][rate_index]
+        padding = (data[pos + 2] >> 1) & 1
+        if layer == 1:
+            samples = 384
+            length = (12 * bitrate // rate + padding) * 4
+        else:
+            samples = 1152 if layer == 2 or mpeg1 else 576
+            length = samples // 8 * bitrate // rate + padding
+        if sample_rate is None:
+            sample_rate = rate
+            channels = 1 if data[pos + 3] >> 6 == 3 else 2
+        frames += 1
+        total_samples += samples
+        total_bytes += length
+        pos += length
+    if not frames:
+        raise ValueError("No MPEG audio frames found")
+    duration = total_samples / sample_rate
+    return {
+        "format": "mp3",
+        "duration_seconds": round(duration, 3),
+        "sample_rate": sample_rate,
+        "channels": channels,
+        "bitrate_kbps": round(total_bytes * 8 / duration / 1000) if duration else None
+    }
+
+def waveform_peaks(frames: np.ndarray, count: int) -> List[float]:
+    """Max absolute amplitude across channels in `count` equal buckets"""
+    envelope = np.abs(frames).max(axis=1)
+    if not len(envelope) or count <= 0:
+        return []
+    bucket = math.ceil(len(envelope) / count)
+    buckets = math.ceil(len(envelope) / bucket)
+    envelope = np.pad(envelope, (0, bucket * buckets - len(envelope)))
+    return [round(float(peak), 4) for peak in envelope.reshape(buckets, bucket).max(axis=1)]
+
+def analyze_audio(data: bytes, peaks: int, target_dbfs: float) -> Dict[str, Any]:
+    """Duration, loudness and peaks for WAV; duration only for MP3. Runs in the analysis process pool."""
+    if data[:4] == b"RIFF":
+        frames, sample_rate = decode_wav(data)
+        rms = float(np.sqrt(np.mean(np.square(frames, dtype=np.float64)))) if frames.size else 0.0
+        peak = float(np.abs(frames).max()) if frames.size else 0.0
+        rms_dbfs = 20 * math.log10(rms) if rms > 0 else None
+        peak_dbfs = 20 * math.log10(peak) if peak > 0 else None
+        # Gain towards the target loudness, never enough to clip the loudest sample
+        gain_db = min(target_dbfs - rms_dbfs, -peak_dbfs) if rms_dbfs is not None else 0.0
+        return {
+            "format": "wav",
+            "duration_seconds": round(len(frames) / sample_rate, 3),
+            "sample_rate": sample_rate,
+            "channels": frames.shape[1],
+            "rms_dbfs": round(rms_dbfs, 2) if rms_dbfs is not None else None,
+            "peak_dbfs": round(peak_dbfs, 2) if peak_dbfs is not None else None,
+            "gain_db": round(gain_db, 2),
+            "peaks": waveform_peaks(frames, peaks)
+        }
+    if data[:3] == b"ID3" or (len(data) > 1 and data[0] == 0xFF and data[1] & 0xE0 == 0xE0):
+        return scan_mp3_frames(data)
+    raise ValueError("Unsupported audio format")
+
+def format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+class AudioAnalysisQueue:
+    """In-process job queue feeding uploaded songs to a process pool for analysis.
+
+    Jobs are song ids; `analysis_status` on the song is the durable record, so
+    songs left "pending" by a restart are re-enqueued at startup.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._queued: set = set()
+        self._executor = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_run_seconds = 0.0
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def enqueue(self, song_id: str):
+        if song_id not in self._queued:
+            self._queued.add(song_id)
+            self._queue.put_nowait(song_id)
+
+    async def run_worker(self):
+        while True:
+            song_id = await self._queue.get()
+            self._queued.discard(song_id)
+            self.in_flight += 1
+            started_at = time.perf_counter()
+            try:
+                await self.analyze(song_id)
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"Audio analysis of song {song_id} failed: {e}")
+                await db.songs.update_one({"_id": ObjectId(song_id)}, {"$set": {"analysis_status": "failed", "analysis_error": str(e)}})
+            finally:
+                self.in_flight -= 1
+                self.total_run_seconds += time.perf_counter() - started_at
+
+    async def analyze(self, song_id: str):
+        song = await db.songs.find_one({"_id": ObjectId(song_id)}, {"peaks": 0})
+        if not song:
+            return
+        size = song.get("audio_size") or len(song.get("audio_data", "")) * 3 // 4
+        if size > AUDIO_ANALYSIS_MAX_BYTES:
+            await db.songs.update_one({"_id": song["_id"]}, {"$set": {"analysis_status": "skipped"}})
+            return
+        
+        audio = await read_audio(song)
+        loop = asyncio.get_running_loop()
+        try:
+            analysis = await loop.run_in_executor(
+                self._get_executor(), analyze_audio, audio, AUDIO_ANALYSIS_PEAKS, AUDIO_ANALYSIS_TARGET_DBFS
+            )
+        except ValueError as e:
+            await db.songs.update_one({"_id": song["_id"]}, {"$set": {"analysis_status": "unsupported", "analysis_error": str(e)}})
+            return
+        
+        peaks = analysis.pop("peaks", None)
+        async with change_journal.write() as seq:
+            await db.songs.update_one(
+                {"_id": song["_id"]},
+                {
+                    "$set": {
+                        "analysis_status": "done",
+                        "analysis": analysis,
+                        "peaks": peaks,
+                        "duration": format_duration(analysis["duration_seconds"]),
+                        "analyzed_at": datetime.utcnow(),
+                        "_seq": seq
+                    },
+                    "$unset": {"analysis_error": ""}
+                }
+            )
+        self.completed += 1
+        song_catalog.invalidate()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def metrics(self) -> Dict[str, Any]:
+        finished = self.completed + self.failed
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize(),
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_run_ms": round(self.total_run_seconds / finished * 1000, 2) if finished else 0.0
+        }
+
+audio_analysis = AudioAnalysisQueue(AUDIO_ANALYSIS_WORKERS)
+
+async def enqueue_pending_analysis():
+    """Re-enqueue songs whose analysis was interrupted by a restart"""
+    async for song in db.songs.find({"analysis_status": "pending"}, {"_id": 1}):
+        audio_analysis.enqueue(str(song["_id"]))
+
+# ========== LOCAL SPOOL ==========
+
+class SpoolFile:
+    """Append-only local file owned by this process, rotated into batch files for replay.
+
+    Workers can share one directory: each appends to its own
+    `active-<pid>-<token>.<suffix>` file and holds an exclusive flock on it while
+    it is open. An active file nobody holds a lock on belongs to a process that
+    has exited, and `claim_orphans` turns it into a batch. Batches are locked
+    while they are applied, so two workers never replay the same one at once.
+    """
+
+    def __init__(self, root: Path, suffix: str, legacy_active: Optional[str] = None):
+        self.root = root
+        self.suffix = suffix
+        # The single shared active file earlier versions wrote, recovered like any orphan
+        self.legacy_active = legacy_active
+        self.active_path = root / f"active-{os.getpid()}-{uuid.uuid4().hex[:8]}.{suffix}"
+        self._file = None
+        self._held: Dict[Path, Any] = {}
+        self.orphans_claimed = 0
+
+    def append(self, line: str):
+        while self._file is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            handle = open(self.active_path, "a")
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            # Another worker may have claimed the file between open and flock
+            if self.active_path.exists() and os.stat(self.active_path).st_ino == os.fstat(handle.fileno()).st_ino:
+                self._file = handle
+            else:
+                handle.close()
+        # Flushed to the OS per line so a process crash loses nothing; fsync happens per batch
+        self._file.write(line + "\n")
+        self._file.flush()
+
+    def _batch_path(self) -> Path:
+        # Time-ordered names so older batches are replayed first
+        return self.root / f"{time.time_ns()}-{uuid.uuid4().hex[:8]}.{self.suffix}"
+
+    def rotate(self) -> Optional[Path]:
+        """Close the active file into a new batch, which stays locked by this process"""
+        if self._file is None:
+            return None
+        os.fsync(self._file.fileno())
+        batch = self._batch_path()
+        os.replace(self.active_path, batch)
+        self._held[batch] = self._file
+        self._file = None
+        return batch
+
+    def claim_orphans(self):
+        """Turn active files left by processes that have exited into batches"""
+        if not self.root.exists():
+            return
+        paths = list(self.root.glob(f"active-*.{self.suffix}"))
+        if self.legacy_active:
+            paths.append(self.root / self.legacy_active)
+        for path in paths:
+            if path == self.active_path:
+                continue
+            with self.locked(path) as held:
+                if held:
+                    os.replace(path, self._batch_path())
+                    self.orphans_claimed += 1
+
+    def batches(self) -> List[Path]:
+        if not self.root.exists():
+            return []
+        return sorted(path for path in self.root.glob(f"*.{self.suffix}") if not path.name.startswith("active"))
+
+    @contextmanager
+    def locked(self, path: Path):
+        """Hold the lock on `path` for the block; yields False if another process has it or it is gone"""
+        handle = self._held.pop(path, None) or self._try_lock(path)
+        if handle is None:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            handle.close()
+
+    @staticmethod
+    def _try_lock(path: Path):
+        try:
+            handle = open(path, "r")
+        except FileNotFoundError:
+            return None
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            return None
+        if os.fstat(handle.fileno()).st_nlink == 0:
+            # Applied and deleted by another process after we listed it
+            handle.close()
+            return None
+        return handle
+
+# ========== PLAY STATS ==========
+
+PLAY_STATS_BATCH_RETENTION_DAYS = 30
+
+class PlayAggregator:
+    """Batches song play events into periodic bulk upserts on `db.song_stats`.
+
+    Every event is appended to this process's spool file before it is counted in
+    memory. A flush rotates the file into a batch and applies it. Each batch is
+    recorded in `db.play_stats_batches`: a batch marked applied is never applied
+    again, and while one is being applied every stats document it touches keeps
+    the batch id in `applied_batches`, so a replay after a crash mid-apply skips
+    what already landed. The ids are pulled again once the batch is marked applied.
+    """
+
+    def __init__(self, root: Path):
+        self.spool = SpoolFile(root, "batch", legacy_active="active.wal")
+        self._pending: Dict[tuple, List[float]] = {}
+        self._lock = asyncio.Lock()
+        self.events = 0
+        self.flushes = 0
+        self.replayed_batches = 0
+        self.skipped_batches = 0
+        self.refused = 0
+        self.last_flush_ms = 0.0
+
+    def record(self, song_id: str, listened_seconds: float, completed: bool) -> bool:
+        """Count one play; False if it was refused because too many keys are pending"""
+        day = datetime.utcnow().strftime("%Y-%m-%d")
+        if (song_id, day) not in self._pending and len(self._pending) >= PLAY_STATS_MAX_PENDING_KEYS:
+            self.refused += 1
+            return False
+        event = {"s": song_id, "d": day, "t": listened_seconds, "c": int(completed)}
+        self.spool.append(json.dumps(event, separators=(",", ":")))
+        self._add(self._pending, event)
+        self.events += 1
+        return True
+
+    @staticmethod
+    def _add(totals: Dict[tuple, List[float]], event: dict):
+        entry = totals.setdefault((event["s"], event["d"]), [0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += event["t"]
+        entry[2] += event["c"]
+
+    def _read_batch(self, batch: Path) -> Dict[tuple, List[float]]:
+        totals: Dict[tuple, List[float]] = {}
+        for line in batch.read_text().splitlines():
+            try:
+                self._add(totals, json.loads(line))
+            except (ValueError, KeyError):
+                # A torn last line from a crash mid-write
+                continue
+        return totals
 
-def generate_otp() -> str:
-    """Generate 6-digit OTP"""
-    return ''.join(random.choices(string.digits, k=6))
+    async def _apply(self, batch: Path, totals: Dict[tuple, List[float]]):
+        batch_id = batch.stem
+        stats_ids = [f"{song_id}:{day}" for song_id, day in totals]
+        record = await db.play_stats_batches.find_one({"_id": batch_id})
+        if record and record.get("state") == "applied":
+            self.skipped_batches += 1
+        else:
+            now = datetime.utcnow()
+            await db.play_stats_batches.update_one(
+                {"_id": batch_id},
+                {"$setOnInsert": {
+                    "state": "applying",
+                    "started_at": now,
+                    "expire_at": now + timedelta(days=PLAY_STATS_BATCH_RETENTION_DAYS)
+                }},
+                upsert=True
+            )
+            operations = [
+                UpdateOne(
+                    {"_id": stats_id, "applied_batches": {"$ne": batch_id}},
+                    {
+                        "$inc": {"plays": plays, "listened_seconds": listened, "completions": completions},
+                        "$setOnInsert": {"song_id": song_id, "day": day},
+                        "$push": {"applied_batches": batch_id}
+                    },
+                    upsert=True
+                )
+                for stats_id, ((song_id, day), (plays, listened, completions)) in zip(stats_ids, totals.items())
+            ]
+            if operations:
+                try:
+                    await db.song_stats.bulk_write(operations, ordered=False)
+                except BulkWriteError as e:
+                    # Duplicate keys are documents that already applied this batch
+                    if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                        raise
+            await db.play_stats_batches.update_one({"_id": batch_id}, {"$set": {"state": "applied", "applied_at": datetime.utcnow()}})
+        # Guards are only needed while the batch can still be re-applied
+        if stats_ids:
+            await db.song_stats.update_many({"_id": {"$in": stats_ids}}, {"$pull": {"applied_batches": batch_id}})
+        batch.unlink(missing_ok=True)
 
-async def send_sms(phone: str, message: str):
-    """Mock SMS service - replace with actual SMS provider"""
-    logger.info(f"SMS to {phone}: {message}")
-    return True
+    async def flush(self):
+        """Apply pending batch files, then the events collected since the last flush"""
+        async with self._lock:
+            started_at = time.perf_counter()
+            pending, self._pending = self._pending, {}
+            self.spool.claim_orphans()
+            current = self.spool.rotate()
+            loop = asyncio.get_running_loop()
+            for batch in self.spool.batches():
+                with self.spool.locked(batch) as held:
+                    if not held:
+                        continue
+                    if batch == current:
+                        await self._apply(batch, pending)
+                    else:
+                        await self._apply(batch, await loop.run_in_executor(None, self._read_batch, batch))
+                        self.replayed_batches += 1
+            self.flushes += 1
+            self.last_flush_ms = round((time.perf_counter() - started_at) * 1000, 2)
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "events": self.events,
+            "pending_keys": len(self._pending),
+            "flushes": self.flushes,
+            "replayed_batches": self.replayed_batches,
+            "skipped_batches": self.skipped_batches,
+            "refused": self.refused,
+            "orphans_claimed": self.spool.orphans_claimed,
+            "last_flush_ms": self.last_flush_ms
+        }
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+play_stats = PlayAggregator(PLAY_STATS_DIR)
 
-def create_access_token(data: dict) -> str:
-    to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+async def flush_play_stats_periodically():
+    while True:
+        try:
+            await play_stats.flush()
+        except Exception as e:
+            logger.warning(f"Play stats flush failed: {e}")
+        await asyncio.sleep(PLAY_STATS_FLUSH_SECONDS)
 
-def decode_token(token: str) -> dict:
-    try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
-    except jwt.JWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+# ========== AUDIT LOG ==========
 
-def is_email(value: str) -> bool:
-    """Check if the string is an email address"""
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(email_pattern, value))
+class AuditWriter:
+    """Writes admin activities to `db.admin_activities` in background insert_many batches.
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
-    payload = decode_token(token)
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    
-    # Check if user is disabled
-    if user.get("status") == UserStatus.DISABLED:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Account is disabled")
-    
-    return user
+    Each entry gets its `_id` up front and is appended to this process's spool
+    file before it is queued, so a crash or a database outage loses nothing. A
+    flush rotates the file into a batch, inserts it and deletes the file;
+    batches that fail, and files left by exited processes, stay on disk and are
+    replayed, skipping entries already written as duplicate keys. The in-memory
+    queue is bounded - past AUDIT_QUEUE_MAX_SIZE entries are only kept on disk
+    and the batch is read back from its file.
+    """
 
-async def require_admin(current_user: dict = Depends(get_current_user)):
-    if current_user["role"] not in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
-    return current_user
+    def __init__(self, root: Path):
+        self.spool = SpoolFile(root, "spill", legacy_active="active.spill")
+        self._queue: List[dict] = []
+        self._overflowed = False
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self.appended = 0
+        self.written = 0
+        self.unwritten = 0
+        self.overflowed_entries = 0
+        self.flushes = 0
+        self.failures = 0
+        self.replayed_batches = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
 
-async def require_approved_member(current_user: dict = Depends(get_current_user)):
-    if current_user["status"] != UserStatus.APPROVED:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Membership not approved")
-    return current_user
+    def append(self, activity: dict):
+        activity.setdefault("_id", ObjectId())
+        self.spool.append(json_util.dumps(activity))
+        if len(self._queue) < AUDIT_QUEUE_MAX_SIZE:
+            self._queue.append(activity)
+        else:
+            self._overflowed = True
+            self.overflowed_entries += 1
+        self.appended += 1
+        self.unwritten += 1
+        if len(self._queue) >= AUDIT_BATCH_SIZE:
+            self._wake.set()
 
-async def log_admin_activity(admin_id: str, admin_name: str, action: str, target_type: str, target_id: str, details: Dict[str, Any]):
-    """Log admin activities for audit trail"""
-    activity = {
-        "admin_id": admin_id,
-        "admin_name": admin_name,
-        "action": action,
-        "target_type": target_type,
-        "target_id": target_id,
-        "details": details,
-        "timestamp": datetime.utcnow()
-    }
-    await db.admin_activities.insert_one(activity)
-    logger.info(f"Admin activity logged: {action} on {target_type} by {admin_name}")
+    @staticmethod
+    def _read_batch(batch: Path) -> List[dict]:
+        entries = []
+        for line in batch.read_text().splitlines():
+            try:
+                entries.append(json_util.loads(line))
+            except ValueError:
+                # A torn last line from a crash mid-write
+                continue
+        return entries
 
-def user_to_response(user: dict) -> UserResponse:
-    return UserResponse(
-        id=str(user["_id"]),
-        username=user.get("username"),
-        email=user["email"],
-        full_name=user["full_name"],
-        phone=user["phone"],
-        address=user["address"],
-        institution=user["institution"],
-        committee=user["committee"],
-        position=user.get("position"),
-        blood_group=user.get("blood_group"),
-        photo=user.get("photo"),
-        role=user["role"],
-        status=user["status"],
-        membership_id=user.get("membership_id"),
-        issue_date=user.get("issue_date"),
-        created_at=user["created_at"].isoformat() if isinstance(user["created_at"], datetime) else user["created_at"]
-    )
+    async def _apply(self, batch: Path, entries: List[dict]):
+        for start in range(0, len(entries), AUDIT_BATCH_SIZE):
+            try:
+                await db.admin_activities.insert_many(entries[start:start + AUDIT_BATCH_SIZE], ordered=False)
+            except BulkWriteError as e:
+                # Duplicate keys are entries a failed or interrupted flush already wrote
+                if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                    raise
+        batch.unlink(missing_ok=True)
+        self.written += len(entries)
+        self.unwritten = max(0, self.unwritten - len(entries))
+
+    async def flush(self):
+        """Write batch files left by failed flushes or exited processes, then the entries queued since the last flush"""
+        async with self._lock:
+            started_at = time.perf_counter()
+            queued, self._queue = self._queue, []
+            overflowed, self._overflowed = self._overflowed, False
+            self.spool.claim_orphans()
+            current = self.spool.rotate()
+            loop = asyncio.get_running_loop()
+            for batch in self.spool.batches():
+                with self.spool.locked(batch) as held:
+                    if not held:
+                        continue
+                    if batch == current and not overflowed:
+                        await self._apply(batch, queued)
+                    else:
+                        await self._apply(batch, await loop.run_in_executor(None, self._read_batch, batch))
+                        if batch != current:
+                            self.replayed_batches += 1
+            if current:
+                self.flushes += 1
+                self.last_flush_ms = round((time.perf_counter() - started_at) * 1000, 2)
+                self.max_flush_ms = max(self.max_flush_ms, self.last_flush_ms)
+
+    async def run(self):
+        while True:
+            # Flush first, so entries left by a crash are written right after startup
+            try:
+                await self.flush()
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"Audit log flush failed, batch kept for replay: {e}")
+                await asyncio.sleep(AUDIT_FLUSH_SECONDS)
+            try:
+                await asyncio.wait_for(self._wake.wait(), AUDIT_FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": len(self._queue),
+            "unwritten": self.unwritten,
+            "appended": self.appended,
+            "written": self.written,
+            "overflowed_entries": self.overflowed_entries,
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "replayed_batches": self.replayed_batches,
+            "orphans_claimed": self.spool.orphans_claimed,
+            "last_flush_ms": self.last_flush_ms,
+            "max_flush_ms": self.max_flush_ms
+        }
+
+audit_writer = AuditWriter(AUDIT_LOG_DIR)
 
 # ========== AUTHENTICATION ROUTES ==========
 
@@ -318,8 +3195,9 @@ async def signup(user_data: UserCreate):
     
     user_dict = user_data.dict()
     user_dict["username"] = user_data.username.lower()
-    user_dict["password"] = hash_password(user_data.password)
+    user_dict["password"] = await password_hasher.hash(user_data.password)
     user_dict["full_name"] = user_data.full_name or user_data.username
+    user_dict["phone"] = normalize_phone(user_data.phone)
     user_dict["role"] = UserRole.PUBLIC
     user_dict["status"] = UserStatus.PENDING
     user_dict["created_at"] = datetime.utcnow()
@@ -327,10 +3205,14 @@ async def signup(user_data: UserCreate):
     user_dict["membership_id"] = None
     user_dict["issue_date"] = None
     
-    result = await db.users.insert_one(user_dict)
+    try:
+        result = await db.users.insert_one(user_dict)
+    except DuplicateKeyError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=duplicate_user_detail(e))
     user_dict["_id"] = result.inserted_id
+    await track_user_changes([(None, user_dict)])
     
-    access_token = create_access_token({"sub": str(result.inserted_id)})
+    access_token = create_access_token(token_claims(user_dict))
     
     return TokenResponse(
         access_token=access_token,
@@ -352,14 +3234,14 @@ async def login(login_data: LoginRequest):
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     
-    if not verify_password(login_data.password, user["password"]):
+    if not await password_hasher.verify(login_data.password, user["password"]):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     
     # Check if user is disabled
     if user.get("status") == UserStatus.DISABLED:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Account is disabled")
     
-    access_token = create_access_token({"sub": str(user["_id"])})
+    access_token = create_access_token(token_claims(user))
     return TokenResponse(
         access_token=access_token,
         token_type="bearer",
@@ -370,13 +3252,13 @@ async def login(login_data: LoginRequest):
 async def login_with_email(login_data: EmailPasswordLogin):
     """Login with email and password (legacy support)"""
     user = await db.users.find_one({"email": login_data.email})
-    if not user or not verify_password(login_data.password, user["password"]):
+    if not user or not await password_hasher.verify(login_data.password, user["password"]):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     
     if user.get("status") == UserStatus.DISABLED:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Account is disabled")
     
-    access_token = create_access_token({"sub": str(user["_id"])})
+    access_token = create_access_token(token_claims(user))
     return TokenResponse(
         access_token=access_token,
         token_type="bearer",
@@ -435,7 +3317,7 @@ async def verify_otp(otp_verify: PhoneOTPVerify):
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
-    access_token = create_access_token({"sub": str(user["_id"])})
+    access_token = create_access_token(token_claims(user))
     return TokenResponse(
         access_token=access_token,
         token_type="bearer",
@@ -450,12 +3332,15 @@ async def get_me(current_user: dict = Depends(get_current_user)):
 
 @api_router.get("/admin/users", response_model=List[UserResponse])
 async def get_all_users(
+    response: Response,
     admin: dict = Depends(require_admin),
     status_filter: Optional[str] = None,
     role_filter: Optional[str] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
 ):
-    """Get all users with optional filters"""
+    """Get users with optional filters, newest first - pass X-Next-Cursor back as `cursor` for the next page"""
     query = {}
     if status_filter:
         query["status"] = status_filter
@@ -468,18 +3353,15 @@ async def get_all_users(
             {"username": {"$regex": search, "$options": "i"}}
         ]
     
-    users = await db.users.find(query).sort("created_at", -1).to_list(1000)
+    users, next_cursor = await fetch_page(db.users, query, "created_at", -1, limit, cursor)
+    set_next_cursor(response, next_cursor)
     return [user_to_response(user) for user in users]
 
 @api_router.put("/admin/users/{user_id}/approve", response_model=UserResponse)
 async def approve_user(user_id: str, admin: dict = Depends(require_admin)):
     """Approve a pending user"""
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    
-    count = await db.users.count_documents({"status": UserStatus.APPROVED}) + 1
-    membership_id = f"ANNFSU-{count:05d}"
+    await check_approvable(ObjectId(user_id))
+    membership_id = (await allocate_membership_ids())[0]
     
     update_dict = {
         "status": UserStatus.APPROVED,
@@ -489,8 +3371,16 @@ async def approve_user(user_id: str, admin: dict = Depends(require_admin)):
         "updated_at": datetime.utcnow()
     }
     
-    await db.users.update_one({"_id": ObjectId(user_id)}, {"$set": update_dict})
-    updated_user = await db.users.find_one({"_id": ObjectId(user_id)})
+    updated_user = await update_one_and_fetch(
+        db.users,
+        ObjectId(user_id),
+        {"$set": update_dict, "$inc": {"token_version": 1}},
+        preconditions={"status": {"$ne": UserStatus.APPROVED}},
+        precondition_detail="Already approved",
+        precondition_status=status.HTTP_400_BAD_REQUEST,
+        track_user_stats=True
+    )
+    await user_access_changed(user_id, updated_user)
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -498,7 +3388,7 @@ async def approve_user(user_id: str, admin: dict = Depends(require_admin)):
         "approve",
         "user",
         user_id,
-        {"user_name": user["full_name"], "membership_id": membership_id}
+        {"user_name": updated_user["full_name"], "membership_id": membership_id}
     )
     
     return user_to_response(updated_user)
@@ -506,15 +3396,13 @@ async def approve_user(user_id: str, admin: dict = Depends(require_admin)):
 @api_router.put("/admin/users/{user_id}/reject", response_model=UserResponse)
 async def reject_user(user_id: str, admin: dict = Depends(require_admin)):
     """Reject a pending user"""
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    
-    await db.users.update_one(
-        {"_id": ObjectId(user_id)},
-        {"$set": {"status": UserStatus.REJECTED, "updated_at": datetime.utcnow()}}
+    updated_user = await update_one_and_fetch(
+        db.users,
+        ObjectId(user_id),
+        {"$set": {"status": UserStatus.REJECTED, "updated_at": datetime.utcnow()}, "$inc": {"token_version": 1}},
+        track_user_stats=True
     )
-    updated_user = await db.users.find_one({"_id": ObjectId(user_id)})
+    await user_access_changed(user_id, updated_user)
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -522,7 +3410,7 @@ async def reject_user(user_id: str, admin: dict = Depends(require_admin)):
         "reject",
         "user",
         user_id,
-        {"user_name": user["full_name"]}
+        {"user_name": updated_user["full_name"]}
     )
     
     return user_to_response(updated_user)
@@ -530,15 +3418,13 @@ async def reject_user(user_id: str, admin: dict = Depends(require_admin)):
 @api_router.put("/admin/users/{user_id}/enable", response_model=UserResponse)
 async def enable_user(user_id: str, admin: dict = Depends(require_admin)):
     """Enable a disabled user"""
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    
-    await db.users.update_one(
-        {"_id": ObjectId(user_id)},
-        {"$set": {"status": UserStatus.APPROVED, "updated_at": datetime.utcnow()}}
+    updated_user = await update_one_and_fetch(
+        db.users,
+        ObjectId(user_id),
+        {"$set": {"status": UserStatus.APPROVED, "updated_at": datetime.utcnow()}, "$inc": {"token_version": 1}},
+        track_user_stats=True
     )
-    updated_user = await db.users.find_one({"_id": ObjectId(user_id)})
+    await user_access_changed(user_id, updated_user)
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -546,7 +3432,7 @@ async def enable_user(user_id: str, admin: dict = Depends(require_admin)):
         "enable",
         "user",
         user_id,
-        {"user_name": user["full_name"]}
+        {"user_name": updated_user["full_name"]}
     )
     
     return user_to_response(updated_user)
@@ -554,19 +3440,16 @@ async def enable_user(user_id: str, admin: dict = Depends(require_admin)):
 @api_router.put("/admin/users/{user_id}/disable", response_model=UserResponse)
 async def disable_user(user_id: str, admin: dict = Depends(require_admin)):
     """Disable a user account"""
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    
     # Prevent disabling super admin
-    if user.get("role") == UserRole.SUPER_ADMIN:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot disable Super Admin")
-    
-    await db.users.update_one(
-        {"_id": ObjectId(user_id)},
-        {"$set": {"status": UserStatus.DISABLED, "updated_at": datetime.utcnow()}}
+    updated_user = await update_one_and_fetch(
+        db.users,
+        ObjectId(user_id),
+        {"$set": {"status": UserStatus.DISABLED, "updated_at": datetime.utcnow()}, "$inc": {"token_version": 1}},
+        preconditions={"role": {"$ne": UserRole.SUPER_ADMIN}},
+        precondition_detail="Cannot disable Super Admin",
+        track_user_stats=True
     )
-    updated_user = await db.users.find_one({"_id": ObjectId(user_id)})
+    await user_access_changed(user_id, updated_user)
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -574,7 +3457,7 @@ async def disable_user(user_id: str, admin: dict = Depends(require_admin)):
         "disable",
         "user",
         user_id,
-        {"user_name": user["full_name"]}
+        {"user_name": updated_user["full_name"]}
     )
     
     return user_to_response(updated_user)
@@ -582,10 +3465,6 @@ async def disable_user(user_id: str, admin: dict = Depends(require_admin)):
 @api_router.put("/admin/users/{user_id}/role", response_model=UserResponse)
 async def update_user_role(user_id: str, role: str, admin: dict = Depends(require_admin)):
     """Update user role"""
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    
     valid_roles = [UserRole.PUBLIC, UserRole.MEMBER, UserRole.ADMIN]
     if role not in valid_roles:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid role")
@@ -594,11 +3473,13 @@ async def update_user_role(user_id: str, role: str, admin: dict = Depends(requir
     if role == UserRole.ADMIN and admin.get("role") != UserRole.SUPER_ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only Super Admin can assign admin role")
     
-    await db.users.update_one(
-        {"_id": ObjectId(user_id)},
-        {"$set": {"role": role, "updated_at": datetime.utcnow()}}
+    updated_user = await update_one_and_fetch(
+        db.users,
+        ObjectId(user_id),
+        {"$set": {"role": role, "updated_at": datetime.utcnow()}, "$inc": {"token_version": 1}},
+        track_user_stats=True
     )
-    updated_user = await db.users.find_one({"_id": ObjectId(user_id)})
+    await user_access_changed(user_id, updated_user)
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -606,11 +3487,162 @@ async def update_user_role(user_id: str, role: str, admin: dict = Depends(requir
         "update_role",
         "user",
         user_id,
-        {"user_name": user["full_name"], "new_role": role}
+        {"user_name": updated_user["full_name"], "new_role": role}
     )
     
     return user_to_response(updated_user)
 
+BULK_USER_ACTIONS = {
+    "approve": UserStatus.APPROVED,
+    "reject": UserStatus.REJECTED,
+    "disable": UserStatus.DISABLED
+}
+
+def bulk_action_skip_reason(action: str, user: dict) -> Optional[str]:
+    """Why a user cannot take part in a bulk action, or None if they can"""
+    if user.get("role") == UserRole.SUPER_ADMIN:
+        return f"Cannot {action} Super Admin"
+    if user.get("status") == BULK_USER_ACTIONS[action]:
+        return f"Already {BULK_USER_ACTIONS[action]}"
+    return None
+
+def bulk_update_applied(current: Optional[dict], updated_user: dict) -> bool:
+    """Whether the stored user still carries this bulk request's write"""
+    return current is not None and all(
+        current.get(field) == updated_user.get(field) for field in ("status", "updated_at", "membership_id")
+    )
+
+@api_router.post("/admin/users/bulk", response_model=BulkUserActionResponse)
+async def bulk_user_action(bulk: BulkUserAction, admin: dict = Depends(require_admin)):
+    """Approve, reject or disable many users at once"""
+    if bulk.action not in BULK_USER_ACTIONS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid action")
+    user_ids = list(dict.fromkeys(bulk.user_ids))
+    if len(user_ids) > BULK_ACTION_MAX_USERS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {BULK_ACTION_MAX_USERS} users per request")
+    
+    results: Dict[str, BulkUserActionResult] = {}
+    object_ids = []
+    for user_id in user_ids:
+        if ObjectId.is_valid(user_id):
+            object_ids.append(ObjectId(user_id))
+        else:
+            results[user_id] = BulkUserActionResult(user_id=user_id, status="invalid_id", detail="Invalid user id")
+    
+    users = {str(user["_id"]): user for user in await db.users.find({"_id": {"$in": object_ids}}).to_list(None)}
+    eligible = []
+    for user_id in user_ids:
+        if user_id in results:
+            continue
+        user = users.get(user_id)
+        if not user:
+            results[user_id] = BulkUserActionResult(user_id=user_id, status="not_found", detail="User not found")
+            continue
+        reason = bulk_action_skip_reason(bulk.action, user)
+        if reason:
+            results[user_id] = BulkUserActionResult(user_id=user_id, status="skipped", detail=reason)
+            continue
+        eligible.append(user)
+    
+    membership_ids = await allocate_membership_ids(len(eligible)) if bulk.action == "approve" else []
+    operations = []
+    details_by_user = {}
+    changes = []
+    # BSON dates keep milliseconds; truncate so the stamp compares equal when read back
+    now = datetime.utcnow()
+    now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+    for index, user in enumerate(eligible):
+        update_dict = {"status": BULK_USER_ACTIONS[bulk.action], "updated_at": now}
+        details = {"user_name": user["full_name"], "bulk": True}
+        if bulk.action == "approve":
+            update_dict.update({
+                "role": UserRole.MEMBER,
+                "membership_id": membership_ids[index],
+                "issue_date": now.isoformat()
+            })
+            details["membership_id"] = membership_ids[index]
+        update = {"$set": update_dict, "$inc": {"token_version": 1}}
+        # The status precondition makes a user changed since the read above lose rather than be overwritten
+        operations.append(UpdateOne(
+            {"_id": user["_id"], "status": user.get("status"), "role": {"$ne": UserRole.SUPER_ADMIN}},
+            update
+        ))
+        user_id = str(user["_id"])
+        changes.append((user_id, apply_update(user, update)))
+        details_by_user[user_id] = details
+    
+    if operations:
+        outcome = await db.users.bulk_write(operations, ordered=False)
+        if outcome.matched_count < len(operations):
+            # Some filters missed; only users still carrying this request's stamp were written by it
+            current = {
+                str(user["_id"]): user
+                for user in await db.users.find({"_id": {"$in": [users[user_id]["_id"] for user_id, _ in changes]}}).to_list(None)
+            }
+            lost = {user_id for user_id, updated_user in changes if not bulk_update_applied(current.get(user_id), updated_user)}
+            for user_id in lost:
+                results[user_id] = BulkUserActionResult(user_id=user_id, status="conflict", detail="User changed during the bulk action")
+            changes = [(user_id, updated_user) for user_id, updated_user in changes if user_id not in lost]
+        for user_id, updated_user in changes:
+            results[user_id] = BulkUserActionResult(user_id=user_id, status="updated", user=user_to_response(updated_user))
+        await track_user_changes([(users[user_id], updated_user) for user_id, updated_user in changes])
+        await users_access_changed(changes)
+        await log_admin_activities([
+            admin_activity(str(admin["_id"]), admin["full_name"], bulk.action, "user", user_id, details_by_user[user_id])
+            for user_id, _ in changes
+        ])
+    
+    ordered_results = [results[user_id] for user_id in user_ids]
+    updated = sum(1 for result in ordered_results if result.status == "updated")
+    return BulkUserActionResponse(
+        action=bulk.action,
+        updated=updated,
+        failed=len(ordered_results) - updated,
+        results=ordered_results
+    )
+
+@api_router.post("/admin/membership-ids/repair")
+async def repair_membership_ids(admin: dict = Depends(require_admin), dry_run: bool = True):
+    """Find users sharing a membership ID and reissue fresh IDs to all but the earliest holder"""
+    if admin.get("role") != UserRole.SUPER_ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only Super Admin can repair membership IDs")
+    
+    collisions = await find_membership_id_collisions()
+    found = [
+        {"membership_id": group["_id"], "user_ids": [str(user["_id"]) for user in group["users"]]}
+        for group in collisions
+    ]
+    reissue = [(group["_id"], user) for group in collisions for user in group["users"][1:]]
+    if dry_run or not reissue:
+        return {"dry_run": dry_run, "collisions": found, "reissued": []}
+    
+    new_ids = await allocate_membership_ids(len(reissue))
+    issue_date = datetime.utcnow().isoformat()
+    await db.users.bulk_write([
+        UpdateOne(
+            {"_id": user["_id"], "membership_id": old_id},
+            {"$set": {"membership_id": new_id, "issue_date": issue_date, "updated_at": datetime.utcnow()}}
+        )
+        for (old_id, user), new_id in zip(reissue, new_ids)
+    ], ordered=False)
+    
+    reissued = []
+    for (old_id, user), new_id in zip(reissue, new_ids):
+        principal_cache.invalidate(str(user["_id"]))
+        await log_admin_activity(
+            str(admin["_id"]),
+            admin["full_name"],
+            "reissue_membership_id",
+            "user",
+            str(user["_id"]),
+            {"user_name": user.get("full_name"), "old_membership_id": old_id, "membership_id": new_id}
+        )
+        reissued.append({"user_id": str(user["_id"]), "old_membership_id": old_id, "membership_id": new_id})
+    
+    # The unique membership_id index can only be built once the duplicates are gone
+    await ensure_indexes()
+    return {"dry_run": False, "collisions": found, "reissued": reissued}
+
 # ========== MEMBER MANAGEMENT ROUTES ==========
 
 @api_router.post("/members", response_model=UserResponse)
@@ -624,8 +3656,9 @@ async def create_member(user_data: UserCreate, admin: dict = Depends(require_adm
     
     user_dict = user_data.dict()
     user_dict["username"] = user_data.username.lower()
-    user_dict["password"] = hash_password(user_data.password)
+    user_dict["password"] = await password_hasher.hash(user_data.password)
     user_dict["full_name"] = user_data.full_name or user_data.username
+    user_dict["phone"] = normalize_phone(user_data.phone)
     user_dict["role"] = UserRole.MEMBER
     user_dict["status"] = UserStatus.PENDING
     user_dict["created_at"] = datetime.utcnow()
@@ -633,8 +3666,12 @@ async def create_member(user_data: UserCreate, admin: dict = Depends(require_adm
     user_dict["membership_id"] = None
     user_dict["issue_date"] = None
     
-    result = await db.users.insert_one(user_dict)
+    try:
+        result = await db.users.insert_one(user_dict)
+    except DuplicateKeyError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=duplicate_user_detail(e))
     user_dict["_id"] = result.inserted_id
+    await track_user_changes([(None, user_dict)])
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -664,25 +3701,34 @@ async def apply_for_membership(current_user: dict = Depends(get_current_user)):
         "updated_at": datetime.utcnow()
     }
     
-    await db.users.update_one({"_id": ObjectId(user_id)}, {"$set": update_dict})
-    updated_user = await db.users.find_one({"_id": ObjectId(user_id)})
+    updated_user = await update_one_and_fetch(
+        db.users,
+        ObjectId(user_id),
+        {"$set": update_dict, "$inc": {"token_version": 1}},
+        track_user_stats=True
+    )
+    await user_access_changed(user_id, updated_user)
     
     return user_to_response(updated_user)
 
 @api_router.get("/members", response_model=List[UserResponse])
 async def get_members(
+    response: Response,
     admin: dict = Depends(require_admin),
     status_filter: Optional[str] = None,
-    committee_filter: Optional[str] = None
+    committee_filter: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
 ):
-    """Get all members with optional filters"""
+    """Get members with optional filters, newest first - pass X-Next-Cursor back as `cursor` for the next page"""
     query = {}
     if status_filter:
         query["status"] = status_filter
     if committee_filter:
         query["committee"] = committee_filter
     
-    users = await db.users.find(query).sort("created_at", -1).to_list(1000)
+    users, next_cursor = await fetch_page(db.users, query, "created_at", -1, limit, cursor)
+    set_next_cursor(response, next_cursor)
     return [user_to_response(user) for user in users]
 
 @api_router.get("/members/{member_id}", response_model=UserResponse)
@@ -696,12 +3742,8 @@ async def get_member(member_id: str, current_user: dict = Depends(get_current_us
 @api_router.put("/members/{member_id}/approve", response_model=UserResponse)
 async def approve_member(member_id: str, admin: dict = Depends(require_admin)):
     """Approve a pending member and generate membership card"""
-    user = await db.users.find_one({"_id": ObjectId(member_id)})
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Member not found")
-    
-    count = await db.users.count_documents({"status": UserStatus.APPROVED}) + 1
-    membership_id = f"ANNFSU-{count:05d}"
+    await check_approvable(ObjectId(member_id), not_found_detail="Member not found")
+    membership_id = (await allocate_membership_ids())[0]
     
     update_dict = {
         "status": UserStatus.APPROVED,
@@ -710,8 +3752,17 @@ async def approve_member(member_id: str, admin: dict = Depends(require_admin)):
         "updated_at": datetime.utcnow()
     }
     
-    await db.users.update_one({"_id": ObjectId(member_id)}, {"$set": update_dict})
-    updated_user = await db.users.find_one({"_id": ObjectId(member_id)})
+    updated_user = await update_one_and_fetch(
+        db.users,
+        ObjectId(member_id),
+        {"$set": update_dict, "$inc": {"token_version": 1}},
+        preconditions={"status": {"$ne": UserStatus.APPROVED}},
+        not_found_detail="Member not found",
+        precondition_detail="Already approved",
+        precondition_status=status.HTTP_400_BAD_REQUEST,
+        track_user_stats=True
+    )
+    await user_access_changed(member_id, updated_user)
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -719,7 +3770,7 @@ async def approve_member(member_id: str, admin: dict = Depends(require_admin)):
         "approve",
         "member",
         member_id,
-        {"member_name": user["full_name"], "membership_id": membership_id}
+        {"member_name": updated_user["full_name"], "membership_id": membership_id}
     )
     
     return user_to_response(updated_user)
@@ -727,15 +3778,14 @@ async def approve_member(member_id: str, admin: dict = Depends(require_admin)):
 @api_router.put("/members/{member_id}/reject", response_model=UserResponse)
 async def reject_member(member_id: str, admin: dict = Depends(require_admin)):
     """Reject a pending member"""
-    user = await db.users.find_one({"_id": ObjectId(member_id)})
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Member not found")
-    
-    await db.users.update_one(
-        {"_id": ObjectId(member_id)},
-        {"$set": {"status": UserStatus.REJECTED, "updated_at": datetime.utcnow()}}
+    updated_user = await update_one_and_fetch(
+        db.users,
+        ObjectId(member_id),
+        {"$set": {"status": UserStatus.REJECTED, "updated_at": datetime.utcnow()}, "$inc": {"token_version": 1}},
+        not_found_detail="Member not found",
+        track_user_stats=True
     )
-    updated_user = await db.users.find_one({"_id": ObjectId(member_id)})
+    await user_access_changed(member_id, updated_user)
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -743,7 +3793,7 @@ async def reject_member(member_id: str, admin: dict = Depends(require_admin)):
         "reject",
         "member",
         member_id,
-        {"member_name": user["full_name"]}
+        {"member_name": updated_user["full_name"]}
     )
     
     return user_to_response(updated_user)
@@ -751,15 +3801,17 @@ async def reject_member(member_id: str, admin: dict = Depends(require_admin)):
 @api_router.put("/members/{member_id}", response_model=UserResponse)
 async def update_member(member_id: str, update_data: MemberUpdate, admin: dict = Depends(require_admin)):
     """Update member details"""
-    user = await db.users.find_one({"_id": ObjectId(member_id)})
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Member not found")
-    
     update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
     update_dict["updated_at"] = datetime.utcnow()
     
-    await db.users.update_one({"_id": ObjectId(member_id)}, {"$set": update_dict})
-    updated_user = await db.users.find_one({"_id": ObjectId(member_id)})
+    updated_user = await update_one_and_fetch(
+        db.users,
+        ObjectId(member_id),
+        {"$set": update_dict, "$inc": {"token_version": 1}},
+        not_found_detail="Member not found",
+        track_user_stats=True
+    )
+    await user_access_changed(member_id, updated_user)
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -767,7 +3819,7 @@ async def update_member(member_id: str, update_data: MemberUpdate, admin: dict =
         "update",
         "member",
         member_id,
-        {"member_name": user["full_name"], "changes": update_dict}
+        {"member_name": updated_user["full_name"], "changes": update_dict}
     )
     
     return user_to_response(updated_user)
@@ -788,21 +3840,28 @@ async def update_profile(profile_data: ProfileUpdate, current_user: dict = Depen
     user_id = str(current_user["_id"])
     
     update_dict = {k: v for k, v in profile_data.dict().items() if v is not None}
+    if "phone" in update_dict:
+        update_dict["phone"] = normalize_phone(update_dict["phone"])
     update_dict["updated_at"] = datetime.utcnow()
     
-    await db.users.update_one({"_id": ObjectId(user_id)}, {"$set": update_dict})
-    updated_user = await db.users.find_one({"_id": ObjectId(user_id)})
+    try:
+        # A pending user changing committee moves their place in the membership rollups
+        updated_user = await update_one_and_fetch(db.users, ObjectId(user_id), {"$set": update_dict}, track_user_stats=True)
+    except DuplicateKeyError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=duplicate_user_detail(e))
+    principal_cache.invalidate(user_id)
     
     return user_to_response(updated_user)
 
 @api_router.delete("/members/{member_id}")
 async def delete_member(member_id: str, admin: dict = Depends(require_admin)):
     """Delete a member"""
-    user = await db.users.find_one({"_id": ObjectId(member_id)})
+    user = await db.users.find_one_and_delete({"_id": ObjectId(member_id)})
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Member not found")
     
-    result = await db.users.delete_one({"_id": ObjectId(member_id)})
+    await track_user_changes([(user, None)])
+    await user_access_changed(member_id)
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -821,12 +3880,22 @@ async def delete_member(member_id: str, admin: dict = Depends(require_admin)):
 async def create_content(content_data: ContentCreate, admin: dict = Depends(require_admin)):
     """Create new content"""
     content_dict = content_data.dict()
+    content_dict["images"] = await store_images(content_dict["images"] or [])
     content_dict["author_id"] = str(admin["_id"])
     content_dict["created_at"] = datetime.utcnow()
     content_dict["updated_at"] = datetime.utcnow()
     
-    result = await db.content.insert_one(content_dict)
+    try:
+        async with change_journal.write() as seq:
+            content_dict["_seq"] = seq
+            result = await db.content.insert_one(content_dict)
+    except Exception:
+        await release_images(content_dict["images"])
+        raise
     content_dict["_id"] = result.inserted_id
+    public_list_changed("content", [content_dict["type"]])
+    await dashboard_counters.bump({"total_content": 1})
+    await refresh_content_cache(content_dict["type"])
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -848,36 +3917,76 @@ async def create_content(content_data: ContentCreate, admin: dict = Depends(requ
         updated_at=content_dict["updated_at"].isoformat()
     )
 
+@api_router.get("/content/item/{content_id}", response_model=ContentResponse)
+async def get_content_item(content_id: str, request: Request, response: Response):
+    """Get one content item with its full body - public access"""
+    not_modified = conditional_list("content", request, response)
+    if not_modified:
+        return not_modified
+    content = await db.content.find_one({"_id": ObjectId(content_id)}) if ObjectId.is_valid(content_id) else None
+    if not content:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found")
+    return content_to_response(content)
+
+@api_router.get("/content/{content_type}/summary", response_model=List[ContentSummary])
+async def get_content_summaries(
+    content_type: str,
+    request: Request,
+    response: Response,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+):
+    """Get content titles, excerpts and first images by type, newest first - public access"""
+    not_modified = conditional_list("content", request, response)
+    if not_modified:
+        return not_modified
+    body, next_cursor = await public_cache.page("content_summary", content_type, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return raw_json_response(body, response)
+
 @api_router.get("/content/{content_type}", response_model=List[ContentResponse])
-async def get_content_by_type(content_type: str):
-    """Get content by type - public access"""
-    contents = await db.content.find({"type": content_type}).sort("created_at", -1).to_list(1000)
-    return [
-        ContentResponse(
-            id=str(content["_id"]),
-            type=content["type"],
-            title_ne=content["title_ne"],
-            content_ne=content["content_ne"],
-            images=content.get("images", []),
-            author_id=content["author_id"],
-            created_at=content["created_at"].isoformat() if isinstance(content["created_at"], datetime) else content["created_at"],
-            updated_at=content["updated_at"].isoformat() if isinstance(content["updated_at"], datetime) else content["updated_at"]
-        )
-        for content in contents
-    ]
+async def get_content_by_type(
+    content_type: str,
+    request: Request,
+    response: Response,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+):
+    """Get content by type, newest first - public access"""
+    not_modified = conditional_list("content", request, response)
+    if not_modified:
+        return not_modified
+    body, next_cursor = await public_cache.page("content", content_type, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return raw_json_response(body, response)
 
 @api_router.put("/content/{content_id}", response_model=ContentResponse)
 async def update_content(content_id: str, content_data: ContentUpdate, admin: dict = Depends(require_admin)):
     """Update content"""
-    content = await db.content.find_one({"_id": ObjectId(content_id)})
-    if not content:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found")
-    
     update_dict = {k: v for k, v in content_data.dict().items() if v is not None}
     update_dict["updated_at"] = datetime.utcnow()
+    if "images" in update_dict:
+        update_dict["images"] = await store_images(update_dict["images"])
     
-    await db.content.update_one({"_id": ObjectId(content_id)}, {"$set": update_dict})
-    updated_content = await db.content.find_one({"_id": ObjectId(content_id)})
+    try:
+        async with change_journal.write() as seq:
+            update_dict["_seq"] = seq
+            previous_content = await update_one_and_fetch(
+                db.content,
+                ObjectId(content_id),
+                {"$set": update_dict},
+                not_found_detail="Content not found",
+                return_document=ReturnDocument.BEFORE
+            )
+    except Exception:
+        await release_images(update_dict.get("images", []))
+        raise
+    updated_content = {**previous_content, **update_dict}
+    # The type may have changed, so both the old and new groups are stale
+    public_list_changed("content", list({previous_content["type"], updated_content["type"]}))
+    if "images" in update_dict:
+        await release_images(previous_content.get("images", []))
+    await refresh_content_cache(updated_content["type"])
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -885,7 +3994,7 @@ async def update_content(content_id: str, content_data: ContentUpdate, admin: di
         "update",
         "content",
         content_id,
-        {"type": content["type"], "title": content["title_ne"]}
+        {"type": updated_content["type"], "title": updated_content["title_ne"]}
     )
     
     return ContentResponse(
@@ -906,7 +4015,15 @@ async def delete_content(content_id: str, admin: dict = Depends(require_admin)):
     if not content:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Content not found")
     
-    await db.content.delete_one({"_id": ObjectId(content_id)})
+    async with change_journal.write() as seq:
+        result = await db.content.delete_one({"_id": ObjectId(content_id)})
+        if result.deleted_count:
+            await record_deletions("content", [content["_id"]], seq)
+    if result.deleted_count:
+        public_list_changed("content", [content["type"]])
+        await dashboard_counters.bump({"total_content": -1})
+        await refresh_content_cache(content["type"])
+        await release_images(content.get("images", []))
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -924,12 +4041,25 @@ async def delete_content(content_id: str, admin: dict = Depends(require_admin)):
 @api_router.post("/songs", response_model=SongResponse)
 async def create_song(song_data: SongCreate, admin: dict = Depends(require_admin)):
     """Upload song"""
-    song_dict = song_data.dict()
+    audio, content_type = decode_audio_data(song_data.audio_data)
+    song_dict = song_data.dict(exclude={"audio_data"})
+    song_dict.update(await store_audio(audio, song_data.title_ne, content_type))
+    return await insert_song(song_dict, admin)
+
+async def insert_song(song_dict: dict, admin: dict) -> SongResponse:
+    """Create the songs row for audio already in the store"""
     song_dict["uploaded_by"] = str(admin["_id"])
     song_dict["created_at"] = datetime.utcnow()
+    song_dict["analysis_status"] = "pending"
     
-    result = await db.songs.insert_one(song_dict)
+    async with change_journal.write() as seq:
+        song_dict["_seq"] = seq
+        result = await db.songs.insert_one(song_dict)
     song_dict["_id"] = result.inserted_id
+    song_catalog.invalidate()
+    await dashboard_counters.bump({"total_songs": 1})
+    audio_analysis.enqueue(str(result.inserted_id))
+    audio_disk_cache.schedule_fill(song_dict, prefetch=True)
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -937,7 +4067,7 @@ async def create_song(song_data: SongCreate, admin: dict = Depends(require_admin
         "create",
         "song",
         str(result.inserted_id),
-        {"title": song_data.title_ne}
+        {"title": song_dict["title_ne"]}
     )
     
     return SongResponse(
@@ -949,21 +4079,117 @@ async def create_song(song_data: SongCreate, admin: dict = Depends(require_admin
         created_at=song_dict["created_at"].isoformat()
     )
 
-@api_router.get("/songs", response_model=List[SongResponse])
-async def get_songs():
-    """Get all songs - public access"""
-    songs = await db.songs.find().to_list(1000)
-    return [
-        SongResponse(
-            id=str(song["_id"]),
-            title_ne=song["title_ne"],
-            category=song["category"],
-            duration=song.get("duration", "00:00"),
-            uploaded_by=song["uploaded_by"],
-            created_at=song["created_at"].isoformat() if isinstance(song["created_at"], datetime) else song["created_at"]
+@api_router.post("/songs/uploads", response_model=SongUploadStatus)
+async def init_song_upload(upload: SongUploadInit, admin: dict = Depends(require_admin)):
+    """Start a resumable song upload - send the audio with PUT /songs/uploads/{id}?offset=N"""
+    if upload.total_size <= 0 or upload.total_size > SONG_UPLOAD_MAX_SIZE:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"total_size must be between 1 and {SONG_UPLOAD_MAX_SIZE} bytes")
+    
+    SONG_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    session = upload.dict()
+    session.update({
+        "_id": uuid.uuid4().hex,
+        "offset": 0,
+        "created_by": str(admin["_id"]),
+        "created_at": datetime.utcnow(),
+        "expire_at": datetime.utcnow() + timedelta(hours=SONG_UPLOAD_EXPIRE_HOURS)
+    })
+    await db.song_uploads.insert_one(session)
+    song_uploads.path(session["_id"]).touch()
+    return upload_status(session)
+
+@api_router.get("/songs/uploads/{upload_id}", response_model=SongUploadStatus)
+async def get_song_upload(upload_id: str, admin: dict = Depends(require_admin)):
+    """Get the committed offset of an upload, to resume after an interruption"""
+    return upload_status(await get_upload_session(upload_id))
+
+@api_router.put("/songs/uploads/{upload_id}", response_model=SongUploadStatus)
+async def put_song_upload_chunk(upload_id: str, offset: int, request: Request, admin: dict = Depends(require_admin)):
+    """Append the raw request body at `offset`"""
+    async with song_uploads.lock(upload_id):
+        session = await get_upload_session(upload_id)
+        if offset != session["offset"]:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Expected offset {session['offset']}",
+                headers={"Upload-Offset": str(session["offset"])}
+            )
+        
+        hasher = await song_uploads.hasher_at(upload_id, offset)
+        written = await write_upload_chunk(upload_id, offset, request.stream(), hasher)
+        new_offset = offset + written
+        if new_offset > session["total_size"]:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload exceeds total_size")
+        
+        session = await db.song_uploads.find_one_and_update(
+            {"_id": upload_id, "offset": offset},
+            {"$set": {"offset": new_offset}},
+            return_document=ReturnDocument.AFTER
         )
-        for song in songs
-    ]
+        if not session:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload changed concurrently")
+        song_uploads.commit(upload_id, new_offset, hasher)
+        return upload_status(session)
+
+@api_router.post("/songs/uploads/{upload_id}/finalize", response_model=SongResponse)
+async def finalize_song_upload(upload_id: str, admin: dict = Depends(require_admin)):
+    """Verify a complete upload, commit it to the audio store and create the song"""
+    async with song_uploads.lock(upload_id):
+        session = await get_upload_session(upload_id)
+        if session["offset"] != session["total_size"]:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload incomplete: {session['offset']} of {session['total_size']} bytes",
+                headers={"Upload-Offset": str(session["offset"])}
+            )
+        
+        digest = (await song_uploads.hasher_at(upload_id, session["offset"])).hexdigest()
+        if session.get("sha256") and session["sha256"].lower() != digest:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Checksum mismatch")
+        
+        audio_fields = await store_audio_file(
+            song_uploads.path(upload_id),
+            session["total_size"],
+            digest,
+            session["title_ne"],
+            session["content_type"]
+        )
+        song_dict = {
+            "title_ne": session["title_ne"],
+            "category": session["category"],
+            "duration": session["duration"],
+            **audio_fields
+        }
+        await db.song_uploads.delete_one({"_id": upload_id})
+        song_uploads.discard(upload_id)
+    return await insert_song(song_dict, admin)
+
+@api_router.delete("/songs/uploads/{upload_id}")
+async def abort_song_upload(upload_id: str, admin: dict = Depends(require_admin)):
+    """Abandon an upload and delete its staged data"""
+    await get_upload_session(upload_id)
+    await db.song_uploads.delete_one({"_id": upload_id})
+    song_uploads.discard(upload_id)
+    return {"message": "Upload aborted"}
+
+@api_router.get("/songs", response_model=List[SongResponse])
+async def get_songs(
+    request: Request,
+    response: Response,
+    category: Optional[str] = None,
+    sort: str = "created_at",
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+):
+    """Get song metadata, optionally by category; sort is created_at (upload order) or -created_at - public access"""
+    if sort not in SONG_SORTS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"sort must be one of {', '.join(SONG_SORTS)}")
+    not_modified = conditional_list("songs", request, response)
+    if not_modified:
+        return not_modified
+    songs, next_cursor = await song_catalog.page(category, sort, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return songs
 
 @api_router.get("/songs/{song_id}/audio")
 async def get_song_audio(song_id: str):
@@ -971,7 +4197,154 @@ async def get_song_audio(song_id: str):
     song = await db.songs.find_one({"_id": ObjectId(song_id)})
     if not song:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Song not found")
-    return {"audio_data": song["audio_data"]}
+    if "audio_data" in song:
+        return {"audio_data": song["audio_data"]}
+    audio = await read_audio(song)
+    return {"audio_data": f"data:{song['audio_content_type']};base64,{base64.b64encode(audio).decode()}"}
+
+@api_router.get("/songs/{song_id}/analysis")
+async def get_song_analysis(song_id: str):
+    """Get song duration, loudness gain and waveform peaks - public access"""
+    song = await db.songs.find_one(
+        {"_id": ObjectId(song_id)},
+        {"analysis_status": 1, "analysis": 1, "peaks": 1, "duration": 1}
+    )
+    if not song:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Song not found")
+    return {
+        "status": song.get("analysis_status", "not_analyzed"),
+        "duration": song.get("duration", "00:00"),
+        **(song.get("analysis") or {}),
+        "peaks": song.get("peaks") or []
+    }
+
+@api_router.post("/admin/songs/analyze")
+async def analyze_songs(admin: dict = Depends(require_admin), retry_failed: bool = False):
+    """Queue analysis for songs never analyzed (and failed ones with retry_failed=true)"""
+    statuses = [None, "pending"] + (["failed"] if retry_failed else [])
+    queued = 0
+    async for song in db.songs.find({"analysis_status": {"$in": statuses}}, {"_id": 1}):
+        audio_analysis.enqueue(str(song["_id"]))
+        queued += 1
+    return {"queued": queued}
+
+@api_router.post("/songs/{song_id}/play")
+async def record_song_play(song_id: str, play: PlayEvent):
+    """Record one play of a song - public access, counted in batches"""
+    if not ObjectId.is_valid(song_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid song id")
+    if not 0 <= play.listened_seconds <= PLAY_STATS_MAX_LISTEN_SECONDS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid listened_seconds")
+    if not await song_catalog.contains(song_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Song not found")
+    if not play_stats.record(song_id, play.listened_seconds, play.completed):
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many plays pending, try again later")
+    return {"message": "Play recorded"}
+
+@api_router.get("/admin/songs/top")
+async def get_top_songs(admin: dict = Depends(require_admin), days: int = 7, limit: int = 10, by: str = "plays"):
+    """Get the most played songs over the last `days` days, by plays or listened_seconds"""
+    if by not in ("plays", "listened_seconds", "completions"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="by must be plays, listened_seconds or completions")
+    since = (datetime.utcnow() - timedelta(days=max(days, 1) - 1)).strftime("%Y-%m-%d")
+    rows = await db.song_stats.aggregate([
+        {"$match": {"day": {"$gte": since}}},
+        {"$group": {
+            "_id": "$song_id",
+            "plays": {"$sum": "$plays"},
+            "listened_seconds": {"$sum": "$listened_seconds"},
+            "completions": {"$sum": "$completions"}
+        }},
+        {"$sort": {by: -1, "_id": 1}},
+        {"$limit": max(1, min(limit, 100))}
+    ]).to_list(100)
+    
+    titles = {
+        str(song["_id"]): song["title_ne"]
+        async for song in db.songs.find({"_id": {"$in": [ObjectId(row["_id"]) for row in rows]}}, {"title_ne": 1})
+    }
+    return {
+        "since": since,
+        "songs": [
+            {
+                "song_id": row["_id"],
+                "title_ne": titles.get(row["_id"]),
+                "plays": row["plays"],
+                "listened_seconds": round(row["listened_seconds"], 1),
+                "completions": row["completions"]
+            }
+            for row in rows
+        ]
+    }
+
+@api_router.get("/songs/{song_id}/stream")
+async def stream_song_audio(song_id: str, request: Request):
+    """Stream song audio with HTTP Range support - public access"""
+    song = await db.songs.find_one({"_id": ObjectId(song_id)}, {"peaks": 0})
+    if song and "audio_data" in song:
+        # Legacy inline audio moves into the audio store on its first play, so the payload is decoded and hashed once
+        song = await single_flight.do(("migrate_audio", song["_id"]), lambda: migrate_inline_audio(song))
+    if not song:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Song not found")
+    
+    size = song["audio_size"]
+    etag = f'"{song["audio_etag"]}"'
+    content_type = song["audio_content_type"]
+    
+    headers = {"Accept-Ranges": "bytes", "ETag": etag, "Cache-Control": AUDIO_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range == etag:
+        byte_range = parse_range_header(request.headers.get("range"), size)
+    if byte_range:
+        start, end = byte_range
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    else:
+        start, end = 0, size - 1
+        status_code = status.HTTP_200_OK
+    headers["Content-Length"] = str(end - start + 1)
+    
+    if size == 0:
+        body = iter_bytes(b"", 0, -1)
+    else:
+        cached = audio_disk_cache.get(song["audio_etag"])
+        if cached:
+            body = iter_open_file(cached, start, end)
+        else:
+            audio_disk_cache.schedule_fill(song)
+            body = audio_store_for(song.get("audio_store")).iter_range(song["audio_file_id"], start, end)
+    return StreamingResponse(body, status_code=status_code, media_type=content_type, headers=headers)
+
+@api_router.post("/admin/songs/migrate-audio")
+async def migrate_song_audio(admin: dict = Depends(require_admin)):
+    """Move inline base64 audio_data out of song documents into the audio store"""
+    song_ids = [song["_id"] async for song in db.songs.find({"audio_data": {"$exists": True}}, {"_id": 1})]
+    migrated = []
+    failed = []
+    for song_id in song_ids:
+        song = await db.songs.find_one({"_id": song_id, "audio_data": {"$exists": True}})
+        if not song:
+            continue
+        try:
+            if await single_flight.do(("migrate_audio", song_id), lambda: migrate_inline_audio(song)):
+                migrated.append(str(song_id))
+        except HTTPException as e:
+            failed.append({"id": str(song_id), "error": e.detail})
+    
+    await log_admin_activity(
+        str(admin["_id"]),
+        admin["full_name"],
+        "migrate_audio",
+        "song",
+        "*",
+        {"migrated": len(migrated), "failed": len(failed)}
+    )
+    
+    return {"migrated": migrated, "failed": failed, "store": audio_store.kind}
 
 @api_router.delete("/songs/{song_id}")
 async def delete_song(song_id: str, admin: dict = Depends(require_admin)):
@@ -980,7 +4353,14 @@ async def delete_song(song_id: str, admin: dict = Depends(require_admin)):
     if not song:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Song not found")
     
-    await db.songs.delete_one({"_id": ObjectId(song_id)})
+    async with change_journal.write() as seq:
+        result = await db.songs.delete_one({"_id": ObjectId(song_id)})
+        if result.deleted_count:
+            await record_deletions("songs", [song["_id"]], seq)
+    if result.deleted_count:
+        song_catalog.invalidate()
+        await dashboard_counters.bump({"total_songs": -1})
+        await release_audio(song)
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -993,6 +4373,23 @@ async def delete_song(song_id: str, admin: dict = Depends(require_admin)):
     
     return {"message": "Song deleted successfully"}
 
+# ========== BLOB ROUTES ==========
+
+@api_router.get("/blobs/{sha256}")
+async def get_blob(sha256: str, request: Request):
+    """Serve a content-addressed blob (content images) - public access"""
+    blob = await db.blobs.find_one({"_id": sha256})
+    if not blob:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Blob not found")
+    
+    etag = f'"{sha256}"'
+    headers = {"ETag": etag, "Cache-Control": AUDIO_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    headers["Content-Length"] = str(blob["size"])
+    body = audio_store_for(blob.get("store")).iter_range(blob["file_id"], 0, blob["size"] - 1) if blob["size"] else iter_bytes(b"", 0, -1)
+    return StreamingResponse(body, media_type=blob["content_type"], headers=headers)
+
 # ========== CONTACT ROUTES ==========
 
 @api_router.post("/contacts", response_model=ContactResponse)
@@ -1001,8 +4398,13 @@ async def create_contact(contact_data: ContactCreate, admin: dict = Depends(requ
     contact_dict = contact_data.dict()
     contact_dict["created_at"] = datetime.utcnow()
     
-    result = await db.contacts.insert_one(contact_dict)
+    async with change_journal.write() as seq:
+        contact_dict["_seq"] = seq
+        result = await db.contacts.insert_one(contact_dict)
     contact_dict["_id"] = result.inserted_id
+    public_list_changed("contacts", [contact_dict["committee"], None])
+    await dashboard_counters.bump({"total_contacts": 1})
+    await public_cache.refresh("contacts", [contact_dict["committee"], None])
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -1024,36 +4426,36 @@ async def create_contact(contact_data: ContactCreate, admin: dict = Depends(requ
     )
 
 @api_router.get("/contacts", response_model=List[ContactResponse])
-async def get_contacts(committee: Optional[str] = None):
+async def get_contacts(
+    request: Request,
+    response: Response,
+    committee: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+):
     """Get contacts - public access"""
-    query = {}
-    if committee:
-        query["committee"] = committee
-    
-    contacts = await db.contacts.find(query).sort("order", 1).to_list(1000)
-    return [
-        ContactResponse(
-            id=str(contact["_id"]),
-            name_ne=contact["name_ne"],
-            designation_ne=contact["designation_ne"],
-            phone_number=contact["phone_number"],
-            committee=contact["committee"],
-            order=contact.get("order", 0),
-            created_at=contact["created_at"].isoformat() if isinstance(contact["created_at"], datetime) else contact["created_at"]
-        )
-        for contact in contacts
-    ]
+    not_modified = conditional_list("contacts", request, response)
+    if not_modified:
+        return not_modified
+    body, next_cursor = await public_cache.page("contacts", committee or None, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return raw_json_response(body, response)
 
 @api_router.put("/contacts/{contact_id}", response_model=ContactResponse)
 async def update_contact(contact_id: str, contact_data: ContactUpdate, admin: dict = Depends(require_admin)):
     """Update contact"""
-    contact = await db.contacts.find_one({"_id": ObjectId(contact_id)})
-    if not contact:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
-    
     update_dict = {k: v for k, v in contact_data.dict().items() if v is not None}
-    await db.contacts.update_one({"_id": ObjectId(contact_id)}, {"$set": update_dict})
-    updated_contact = await db.contacts.find_one({"_id": ObjectId(contact_id)})
+    async with change_journal.write() as seq:
+        update_dict["_seq"] = seq
+        updated_contact = await update_one_and_fetch(
+            db.contacts,
+            ObjectId(contact_id),
+            {"$set": update_dict},
+            not_found_detail="Contact not found"
+        )
+    # The committee may have changed, so every committee page is suspect
+    public_list_changed("contacts")
+    await public_cache.refresh("contacts", [updated_contact["committee"], None])
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -1061,7 +4463,7 @@ async def update_contact(contact_id: str, contact_data: ContactUpdate, admin: di
         "update",
         "contact",
         contact_id,
-        {"name": contact["name_ne"]}
+        {"name": updated_contact["name_ne"]}
     )
     
     return ContactResponse(
@@ -1081,7 +4483,14 @@ async def delete_contact(contact_id: str, admin: dict = Depends(require_admin)):
     if not contact:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
     
-    await db.contacts.delete_one({"_id": ObjectId(contact_id)})
+    async with change_journal.write() as seq:
+        result = await db.contacts.delete_one({"_id": ObjectId(contact_id)})
+        if result.deleted_count:
+            await record_deletions("contacts", [contact["_id"]], seq)
+    public_list_changed("contacts", [contact["committee"], None])
+    if result.deleted_count:
+        await dashboard_counters.bump({"total_contacts": -1})
+    await public_cache.refresh("contacts", [contact["committee"], None])
     
     await log_admin_activity(
         str(admin["_id"]),
@@ -1094,46 +4503,176 @@ async def delete_contact(contact_id: str, admin: dict = Depends(require_admin)):
     
     return {"message": "Contact deleted successfully"}
 
+# ========== SYNC ROUTES ==========
+
+def synced_content(content: dict) -> dict:
+    return content_to_response(content).dict()
+
+def synced_contact(contact: dict) -> dict:
+    return contact_to_response(contact).dict()
+
+def synced_song(song: dict) -> dict:
+    return song_to_response(song).dict()
+
+# collection -> (projection, serializer) for documents returned by /sync
+SYNC_SOURCES = {
+    "content": (None, synced_content),
+    "contacts": (None, synced_contact),
+    "songs": ({**SONG_LIST_PROJECTION, "_seq": 1}, synced_song),
+}
+
+@api_router.get("/sync")
+async def sync_changes(since: int = 0, limit: int = SYNC_MAX_CHANGES):
+    """Get content, contacts and songs changed after change sequence `since`, plus deletions - public access.
+
+    Start with since=0 and pass back `next_since` each time; keep going while `has_more` is true.
+    """
+    limit = max(1, min(limit, SYNC_MAX_CHANGES))
+    watermark = await change_journal.watermark()
+    seq_range = {"_seq": {"$gt": since, "$lte": watermark}}
+    
+    # One more than `limit` from each source, so a truncated source always shows up as has_more
+    candidates = []
+    for name, (projection, serialize) in SYNC_SOURCES.items():
+        docs = await db[name].find(seq_range, projection).sort("_seq", 1).limit(limit + 1).to_list(limit + 1)
+        candidates.extend((doc["_seq"], name, doc) for doc in docs)
+    tombstones = await db.tombstones.find(seq_range).sort("_seq", 1).limit(limit + 1).to_list(limit + 1)
+    candidates.extend((tombstone["_seq"], "deleted", tombstone) for tombstone in tombstones)
+    candidates.sort(key=lambda candidate: candidate[0])
+    
+    has_more = len(candidates) > limit
+    candidates = candidates[:limit]
+    changes: Dict[str, List[dict]] = {name: [] for name in SYNC_SOURCES}
+    deleted = []
+    for _, name, doc in candidates:
+        if name == "deleted":
+            deleted.append({"collection": doc["collection"], "id": doc["doc_id"]})
+        else:
+            changes[name].append(SYNC_SOURCES[name][1](doc))
+    
+    return {
+        "since": since,
+        "next_since": candidates[-1][0] if has_more else max(watermark, since),
+        "has_more": has_more,
+        "changes": changes,
+        "deleted": deleted
+    }
+
 # ========== ADMIN DASHBOARD ROUTES ==========
 
 @api_router.get("/admin/dashboard/stats", response_model=DashboardStats)
 async def get_dashboard_stats(admin: dict = Depends(require_admin)):
-    """Get dashboard statistics"""
-    total_members = await db.users.count_documents({"role": {"$in": [UserRole.MEMBER, UserRole.ADMIN, UserRole.SUPER_ADMIN]}})
-    pending_requests = await db.users.count_documents({"status": UserStatus.PENDING})
-    approved_members = await db.users.count_documents({"status": UserStatus.APPROVED})
-    rejected_members = await db.users.count_documents({"status": UserStatus.REJECTED})
-    total_content = await db.content.count_documents({})
-    total_songs = await db.songs.count_documents({})
-    total_contacts = await db.contacts.count_documents({})
-    
-    return DashboardStats(
-        total_members=total_members,
-        pending_requests=pending_requests,
-        approved_members=approved_members,
-        rejected_members=rejected_members,
-        total_content=total_content,
-        total_songs=total_songs,
-        total_contacts=total_contacts
+    """Get dashboard statistics from the materialized counters"""
+    return DashboardStats(**await dashboard_counters.get())
+
+@api_router.post("/admin/dashboard/stats/reconcile")
+async def reconcile_dashboard_stats(admin: dict = Depends(require_admin), dry_run: bool = True):
+    """Recount the dashboard statistics and report - or, without dry_run, repair - any drift"""
+    return await dashboard_counters.reconcile(repair=not dry_run)
+
+@api_router.get("/admin/stats/timeseries")
+async def get_membership_timeseries(admin: dict = Depends(require_admin), days: int = 30, committee: Optional[str] = None):
+    """Get daily signups, approvals, rejections and pending backlog per committee for the last `days` days"""
+    days = max(1, min(days, STATS_TIMESERIES_MAX_DAYS))
+    today = datetime.utcnow().date()
+    return await membership_rollups.series(
+        [(today - timedelta(days=offset)).isoformat() for offset in range(days - 1, -1, -1)],
+        committee
+    )
+
+@api_router.post("/admin/stats/timeseries/backfill")
+async def backfill_membership_timeseries(admin: dict = Depends(require_admin)):
+    """Rebuild the membership rollups from the users collection"""
+    if admin.get("role") != UserRole.SUPER_ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only Super Admin can rebuild membership rollups")
+    return await membership_rollups.backfill()
+
+async def still_admin(credentials: HTTPAuthorizationCredentials) -> bool:
+    """Whether the token a stream was opened with would still pass require_admin"""
+    try:
+        await require_admin(await get_current_principal(credentials))
+    except HTTPException:
+        return False
+    return True
+
+async def admin_event_stream(queue: asyncio.Queue, credentials: HTTPAuthorizationCredentials):
+    try:
+        # Current counts first, so a client can render without polling the stats endpoint
+        yield sse_event(None, "stats", await dashboard_counters.get())
+        checked_at = time.monotonic()
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), ADMIN_STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                event = ()
+            if event is None:
+                break
+            # Expiry, revocation, demotion, disabling and deletion end the stream within a heartbeat
+            if time.monotonic() - checked_at >= ADMIN_STREAM_HEARTBEAT_SECONDS:
+                if not await still_admin(credentials):
+                    yield sse_event(None, "revoked", {})
+                    break
+                checked_at = time.monotonic()
+            yield sse_event(*event) if event else b": keepalive\n\n"
+    finally:
+        event_bus.unsubscribe(queue)
+
+@api_router.get("/admin/stream")
+async def stream_admin_events(admin: dict = Depends(require_admin),
+                              credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Server-Sent Events feed of dashboard counter deltas and new admin activities"""
+    if event_bus.subscriber_count >= ADMIN_STREAM_MAX_SUBSCRIBERS:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many live streams open")
+    return StreamingResponse(
+        admin_event_stream(event_bus.subscribe(), credentials),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 @api_router.get("/admin/activities", response_model=List[AdminActivityResponse])
 async def get_admin_activities(admin: dict = Depends(require_admin), limit: int = 50):
     """Get admin activity log"""
     activities = await db.admin_activities.find().sort("timestamp", -1).limit(limit).to_list(limit)
-    return [
-        AdminActivityResponse(
-            id=str(activity["_id"]),
-            admin_id=activity["admin_id"],
-            admin_name=activity["admin_name"],
-            action=activity["action"],
-            target_type=activity["target_type"],
-            target_id=activity["target_id"],
-            details=activity["details"],
-            timestamp=activity["timestamp"].isoformat()
-        )
-        for activity in activities
-    ]
+    return [activity_to_response(activity) for activity in activities]
+
+# ========== METRICS ROUTES ==========
+
+@api_router.get("/admin/metrics")
+async def get_metrics(admin: dict = Depends(require_admin)):
+    """Get in-process performance metrics"""
+    return {
+        "password_hashing": password_hasher.metrics(),
+        "principal_cache": principal_cache.metrics(),
+        "token_versions": token_versions.metrics(),
+        "verified_tokens": verified_tokens.metrics(),
+        "blobs": blob_store.metrics(),
+        "song_catalog": song_catalog.metrics(),
+        "audio_analysis": audio_analysis.metrics(),
+        "audio_disk_cache": audio_disk_cache.metrics(),
+        "play_stats": play_stats.metrics(),
+        "collection_versions": collection_versions.metrics(),
+        "public_cache": public_cache.metrics(),
+        "single_flight": single_flight.metrics(),
+        "change_journal": change_journal.metrics(),
+        "dashboard_stats": dashboard_counters.metrics(),
+        "membership_rollups": membership_rollups.metrics(),
+        "event_bus": event_bus.metrics(),
+        "audit_log": audit_writer.metrics()
+    }
+
+# ========== INDEX ROUTES ==========
+
+@api_router.get("/admin/indexes")
+async def get_index_report(admin: dict = Depends(require_admin), refresh: bool = False):
+    """Get the index bootstrap report - created, drifted, failed and unmanaged indexes"""
+    if refresh:
+        return await ensure_indexes()
+    return index_report
+
+@api_router.get("/admin/indexes/explain")
+async def get_index_explain(admin: dict = Depends(require_admin)):
+    """Get explain() plans for each route's query shape"""
+    return await explain_query_shapes()
 
 # ========== UTILITY ROUTES ==========
 
@@ -1152,12 +4691,13 @@ async def seed_admin():
                 {"email": "admin@annfsu.org"},
                 {"$set": {"username": "admin"}}
             )
+            principal_cache.invalidate(str(existing_admin["_id"]))
         return {"message": "Admin already exists", "username": "admin", "email": "admin@annfsu.org"}
     
     admin_user = {
         "username": "admin",
         "email": "admin@annfsu.org",
-        "password": hash_password("admin123"),
+        "password": await password_hasher.hash("admin123"),
         "full_name": "Admin User",
         "phone": "9851234567",
         "address": "Kathmandu, Nepal",
@@ -1174,7 +4714,11 @@ async def seed_admin():
         "updated_at": datetime.utcnow()
     }
     
-    await db.users.insert_one(admin_user)
+    try:
+        await db.users.insert_one(admin_user)
+    except DuplicateKeyError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=duplicate_user_detail(e))
+    await track_user_changes([(None, admin_user)])
     return {"message": "Admin user created", "username": "admin", "email": "admin@annfsu.org", "password": "admin123"}
 
 @api_router.post("/seed-super-admin")
@@ -1187,7 +4731,7 @@ async def seed_super_admin():
     super_admin = {
         "username": "gopalnepal",
         "email": "gopalnepal@annfsu.org",
-        "password": hash_password("comrade123"),
+        "password": await password_hasher.hash("comrade123"),
         "full_name": "Gopal Nepal",
         "phone": "9800000000",
         "address": "Kathmandu, Nepal",
@@ -1204,7 +4748,11 @@ async def seed_super_admin():
         "updated_at": datetime.utcnow()
     }
     
-    result = await db.users.insert_one(super_admin)
+    try:
+        result = await db.users.insert_one(super_admin)
+    except DuplicateKeyError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=duplicate_user_detail(e))
+    await track_user_changes([(None, super_admin)])
     return {
         "message": "Super Admin created",
         "id": str(result.inserted_id),
@@ -1223,17 +4771,55 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
+background_tasks: List[asyncio.Task] = []
+
+@app.on_event("startup")
+async def start_background_tasks():
+    await asyncio.get_running_loop().run_in_executor(None, audio_disk_cache.load)
+    try:
+        await sync_membership_counter()
+    except Exception as e:
+        logger.error(f"Membership ID counter sync failed: {e}")
+    background_tasks.append(asyncio.create_task(prepare_indexes()))
+    background_tasks.append(asyncio.create_task(backfill_change_seq()))
+    background_tasks.append(asyncio.create_task(cleanup_stale_uploads_periodically()))
+    background_tasks.append(asyncio.create_task(sweep_blobs_periodically()))
+    for _ in range(AUDIO_ANALYSIS_WORKERS):
+        background_tasks.append(asyncio.create_task(audio_analysis.run_worker()))
+    background_tasks.append(asyncio.create_task(enqueue_pending_analysis()))
+    background_tasks.append(asyncio.create_task(flush_play_stats_periodically()))
+    background_tasks.append(asyncio.create_task(audit_writer.run()))
+    background_tasks.append(asyncio.create_task(reconcile_stats_periodically()))
+    background_tasks.append(asyncio.create_task(membership_rollups.backfill_if_empty()))
+    if AUTH_STATELESS_CLAIMS:
+        background_tasks.append(asyncio.create_task(refresh_token_versions_periodically()))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    event_bus.close()
+    for task in background_tasks:
+        task.cancel()
+    try:
+        await play_stats.flush()
+    except Exception as e:
+        logger.warning(f"Final play stats flush failed, batch kept for replay: {e}")
+    try:
+        await audit_writer.flush()
+    except Exception as e:
+        logger.warning(f"Final audit log flush failed, batch kept for replay: {e}")
     client.close()
+    password_hasher.shutdown()
+    audio_analysis.shutdown()
 
 @api_router.post("/seed-contacts")
 async def seed_contacts():
     """Seed contact data from provided list - removes old and adds new"""
     # Delete all existing contacts
-    await db.contacts.delete_many({})
+    old_ids = [contact["_id"] async for contact in db.contacts.find({}, {"_id": 1})]
+    deleted = await db.contacts.delete_many({"_id": {"$in": old_ids}})
     
     # New contact data
     contacts = [
@@ -1329,7 +4915,13 @@ async def seed_contacts():
         }
     ]
     
-    result = await db.contacts.insert_many(contacts)
+    async with change_journal.write(len(old_ids) + len(contacts)) as first_seq:
+        await record_deletions("contacts", old_ids, first_seq)
+        for offset, contact in enumerate(contacts):
+            contact["_seq"] = first_seq + len(old_ids) + offset
+        result = await db.contacts.insert_many(contacts)
+    public_list_changed("contacts")
+    await dashboard_counters.bump({"total_contacts": len(result.inserted_ids) - deleted.deleted_count})
     
     return {
         "message": "Contacts seeded successfully",
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+ANNFSU Backend Microbenchmarks
+Measures the hot paths optimized in backend/server.py
+
+Usage:
+    python backend_benchmark.py token [--iterations N] [--rps N]
+    python backend_benchmark.py updates [--iterations N] [--database NAME]
+    python backend_benchmark.py public [--requests N] [--concurrency N] [--items N]
+
+The updates and public benchmarks need a reachable MongoDB at MONGO_URL. updates
+only writes to bench_* collections of its own database; public seeds content of
+type "bench" in DB_NAME (annfsu_benchmark by default) and removes it afterwards.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# server.py reads these at import time; the token benchmark never talks to MongoDB
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "annfsu_benchmark")
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import server  # noqa: E402
+import httpx  # noqa: E402
+from datetime import datetime  # noqa: E402
+from typing import List, Optional  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from pymongo import ReturnDocument  # noqa: E402
+
+
+def time_per_call(func, iterations):
+    """Return mean wall time per call in microseconds"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def benchmark_token(args):
+    """Compare full HS256 verification against the verified-token cache"""
+    token = server.create_access_token({"sub": "652f1c2ab1e4c8a1f0d3e9b7"})
+
+    def uncached():
+        server.verified_tokens.clear()
+        server.decode_token(token)
+
+    def cached():
+        server.decode_token(token)
+
+    server.decode_token(token)
+    clear_cost = time_per_call(server.verified_tokens.clear, args.iterations)
+    uncached_us = time_per_call(uncached, args.iterations) - clear_cost
+    cached_us = time_per_call(cached, args.iterations)
+    saved_ms_per_second = (uncached_us - cached_us) * args.rps / 1000
+
+    print(f"decode_token uncached : {uncached_us:8.2f} us/request")
+    print(f"decode_token cached   : {cached_us:8.2f} us/request")
+    print(f"speedup               : {uncached_us / cached_us:8.1f}x")
+    print(f"CPU saved at {args.rps} rps : {saved_ms_per_second:8.1f} ms/s "
+          f"({saved_ms_per_second / 10:.1f}% of one core)")
+
+
+# (endpoint, collection, update, preconditions) for every handler moved onto update_one_and_fetch
+UPDATE_SHAPES = [
+    ("approve_user", "users", {"$set": {"status": "approved", "role": "member", "membership_id": "ANNFSU-99999"}, "$inc": {"token_version": 1}}, None),
+    ("reject_user", "users", {"$set": {"status": "rejected"}, "$inc": {"token_version": 1}}, None),
+    ("enable_user", "users", {"$set": {"status": "approved"}, "$inc": {"token_version": 1}}, None),
+    ("disable_user", "users", {"$set": {"status": "disabled"}, "$inc": {"token_version": 1}}, {"role": {"$ne": "super_admin"}}),
+    ("update_user_role", "users", {"$set": {"role": "member"}, "$inc": {"token_version": 1}}, None),
+    ("update_member", "users", {"$set": {"position": "Secretary"}, "$inc": {"token_version": 1}}, None),
+    ("update_profile", "users", {"$set": {"address": "Kathmandu"}}, None),
+    ("update_content", "content", {"$set": {"title_ne": "समाचार"}}, None),
+    ("update_contact", "contacts", {"$set": {"order": 1}}, None),
+]
+
+SEED_DOCUMENTS = {
+    "users": {"full_name": "Benchmark User", "role": "public", "status": "pending", "token_version": 0},
+    "content": {"type": "news", "title_ne": "शीर्षक", "content_ne": "सामग्री", "images": []},
+    "contacts": {"name_ne": "नाम", "designation_ne": "पद", "committee": "central", "order": 0},
+}
+
+
+async def legacy_update(collection, object_id, update, preconditions):
+    """find_one, check, update_one, find_one - the pattern the handlers used before"""
+    document = await collection.find_one({"_id": object_id})
+    if preconditions and document.get("role") == "super_admin":
+        raise RuntimeError("precondition failed")
+    await collection.update_one({"_id": object_id}, update)
+    return await collection.find_one({"_id": object_id})
+
+
+async def atomic_update(collection, object_id, update, preconditions):
+    return await collection.find_one_and_update(
+        {"_id": object_id, **(preconditions or {})},
+        update,
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def time_async(func, iterations):
+    """Return per-call latencies in milliseconds"""
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def run_update_benchmark(args):
+    database = server.client[args.database]
+    print(f"{'endpoint':<18} {'legacy p50':>11} {'atomic p50':>11} {'legacy p95':>11} {'atomic p95':>11} {'saved':>7}")
+    for endpoint, collection_name, update, preconditions in UPDATE_SHAPES:
+        collection = database[f"bench_{collection_name}"]
+        object_id = (await collection.insert_one(dict(SEED_DOCUMENTS[collection_name]))).inserted_id
+        legacy = await time_async(lambda: legacy_update(collection, object_id, update, preconditions), args.iterations)
+        atomic = await time_async(lambda: atomic_update(collection, object_id, update, preconditions), args.iterations)
+        await collection.delete_one({"_id": object_id})
+
+        legacy_p50, atomic_p50 = statistics.median(legacy), statistics.median(atomic)
+        legacy_p95 = statistics.quantiles(legacy, n=20)[-1]
+        atomic_p95 = statistics.quantiles(atomic, n=20)[-1]
+        saved = (1 - atomic_p50 / legacy_p50) * 100 if legacy_p50 else 0.0
+        print(f"{endpoint:<18} {legacy_p50:9.2f}ms {atomic_p50:9.2f}ms {legacy_p95:9.2f}ms {atomic_p95:9.2f}ms {saved:6.1f}%")
+    for collection_name in SEED_DOCUMENTS:
+        await database[f"bench_{collection_name}"].drop()
+
+
+def benchmark_updates(args):
+    """Compare the three-round-trip update pattern with find_one_and_update per endpoint"""
+    asyncio.run(run_update_benchmark(args))
+
+
+BENCH_CONTENT_TYPE = "bench"
+
+legacy_app = FastAPI()
+
+
+@legacy_app.get("/api/content/{content_type}", response_model=List[server.ContentResponse])
+async def legacy_get_content_by_type(content_type: str, limit: int = server.DEFAULT_PAGE_SIZE, cursor: Optional[str] = None):
+    """get_content_by_type as it was before the pre-encoded cache"""
+    contents, _ = await server.fetch_page(server.db.content, {"type": content_type}, "created_at", -1, limit, cursor)
+    return [server.content_to_response(content) for content in contents]
+
+
+async def requests_per_second(app, path, total, concurrency):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        assert (await client.get(path)).status_code == 200
+        remaining = iter(range(total))
+
+        async def worker():
+            for _ in remaining:
+                await client.get(path)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+async def run_public_benchmark(args):
+    now = datetime.utcnow()
+    await server.db.content.insert_many([
+        {
+            "type": BENCH_CONTENT_TYPE,
+            "title_ne": f"समाचार शीर्षक {i}",
+            "content_ne": "विद्यार्थी आन्दोलनको समाचार। " * 40,
+            "images": [],
+            "author_id": "benchmark",
+            "created_at": now,
+            "updated_at": now
+        }
+        for i in range(args.items)
+    ])
+    try:
+        path = f"/api/content/{BENCH_CONTENT_TYPE}"
+        legacy = await requests_per_second(legacy_app, path, args.requests, args.concurrency)
+        cached = await requests_per_second(server.app, path, args.requests, args.concurrency)
+    finally:
+        await server.db.content.delete_many({"type": BENCH_CONTENT_TYPE})
+    print(f"GET {path} ({args.items} items, {args.concurrency} concurrent)")
+    print(f"model + response_model encode : {legacy:8.1f} req/s")
+    print(f"pre-encoded cached bytes      : {cached:8.1f} req/s")
+    print(f"speedup                       : {cached / legacy:8.1f}x")
+
+
+def benchmark_public(args):
+    """Compare the per-request model/encode list path with the pre-encoded public cache"""
+    asyncio.run(run_public_benchmark(args))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ANNFSU backend microbenchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    token_parser = subparsers.add_parser("token", help="JWT decode with and without the verified-token cache")
+    token_parser.add_argument("--iterations", type=int, default=20000)
+    token_parser.add_argument("--rps", type=int, default=1000)
+    token_parser.set_defaults(func=benchmark_token)
+
+    updates_parser = subparsers.add_parser("updates", help="Mutating handlers: find/update/find vs find_one_and_update")
+    updates_parser.add_argument("--iterations", type=int, default=200)
+    updates_parser.add_argument("--database", default="annfsu_benchmark")
+    updates_parser.set_defaults(func=benchmark_updates)
+
+    public_parser = subparsers.add_parser("public", help="Public content list: re-encoded per request vs pre-encoded cache")
+    public_parser.add_argument("--requests", type=int, default=2000)
+    public_parser.add_argument("--concurrency", type=int, default=20)
+    public_parser.add_argument("--items", type=int, default=100)
+    public_parser.set_defaults(func=benchmark_public)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
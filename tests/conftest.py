@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# server.py reads these at import time; motor connects lazily, so no database is needed
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "annfsu_test")
+_scratch = Path(tempfile.mkdtemp(prefix="annfsu-tests-"))
+for name in ("AUDIO_STORE_DIR", "AUDIO_DISK_CACHE_DIR", "SONG_UPLOAD_DIR", "PLAY_STATS_DIR", "AUDIT_LOG_DIR"):
+    os.environ.setdefault(name, str(_scratch / name.lower()))
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
@@ -0,0 +1,104 @@
+import struct
+
+import numpy as np
+import pytest
+
+import server
+
+
+def wav(payload: bytes, channels: int, sample_rate: int, bits: int, format_tag: int = 1,
+        extensible: bool = False, extra_chunk: bytes = b"") -> bytes:
+    """A minimal RIFF/WAVE file around `payload`"""
+    block_align = channels * bits // 8
+    fmt = struct.pack("<HHIIHH", 0xFFFE if extensible else format_tag, channels, sample_rate,
+                      sample_rate * block_align, block_align, bits)
+    if extensible:
+        # cbSize, valid bits, channel mask, then the sub-format GUID whose first two bytes are the real tag
+        fmt += struct.pack("<HHI", 22, bits, 0) + struct.pack("<H", format_tag) + bytes(14)
+    chunks = b"fmt " + struct.pack("<I", len(fmt)) + fmt + extra_chunk
+    chunks += b"data" + struct.pack("<I", len(payload)) + payload
+    return b"RIFF" + struct.pack("<I", 4 + len(chunks)) + b"WAVE" + chunks
+
+
+def test_decode_16_bit_stereo():
+    frames, rate = server.decode_wav(wav(struct.pack("<4h", 0, 16384, -32768, 32767), 2, 8000, 16))
+    assert rate == 8000
+    assert frames.shape == (2, 2)
+    np.testing.assert_allclose(frames, [[0, 0.5], [-1, 32767 / 32768]])
+
+
+def test_decode_8_bit_is_unsigned():
+    frames, _ = server.decode_wav(wav(bytes([128, 0, 255]), 1, 8000, 8))
+    np.testing.assert_allclose(frames[:, 0], [0, -1, 127 / 128])
+
+
+def test_decode_24_bit_sign_extends():
+    payload = (0x400000).to_bytes(3, "little") + (-0x800000 & 0xFFFFFF).to_bytes(3, "little")
+    frames, _ = server.decode_wav(wav(payload, 1, 8000, 24))
+    np.testing.assert_allclose(frames[:, 0], [0.5, -1])
+
+
+def test_decode_float_through_extensible_format():
+    frames, rate = server.decode_wav(wav(struct.pack("<2f", 0.25, -0.75), 1, 48000, 32, format_tag=3, extensible=True))
+    assert rate == 48000
+    np.testing.assert_allclose(frames[:, 0], [0.25, -0.75])
+
+
+def test_odd_sized_chunk_before_data_is_padded():
+    extra = b"LIST" + struct.pack("<I", 3) + b"abc" + b"\x00"
+    frames, _ = server.decode_wav(wav(struct.pack("<2h", 1, 2), 1, 8000, 16, extra_chunk=extra))
+    assert frames.shape == (2, 1)
+
+
+def test_trailing_partial_frame_is_dropped():
+    frames, _ = server.decode_wav(wav(struct.pack("<3h", 1, 2, 3), 2, 8000, 16))
+    assert frames.shape == (1, 2)
+
+
+@pytest.mark.parametrize("data", [
+    b"not a wav file at all",
+    b"RIFF" + struct.pack("<I", 4) + b"WAVE",
+    wav(b"\x00\x00", 1, 8000, 12),
+    wav(b"\x00\x00", 1, 8000, 16, format_tag=2),
+])
+def test_invalid_wav_raises(data):
+    with pytest.raises(ValueError):
+        server.decode_wav(data)
+
+
+def mp3_frame(header: bytes) -> bytes:
+    """One MPEG-1 Layer III frame: 128 kbps at 44.1 kHz without padding is 417 bytes"""
+    return header + bytes(417 - len(header))
+
+
+STEREO = b"\xff\xfb\x90\x00"
+MONO = b"\xff\xfb\x90\xc0"
+
+
+def test_scan_mp3_frames():
+    info = server.scan_mp3_frames(mp3_frame(STEREO) * 3)
+    assert info == {
+        "format": "mp3",
+        "duration_seconds": round(3 * 1152 / 44100, 3),
+        "sample_rate": 44100,
+        "channels": 2,
+        "bitrate_kbps": 128
+    }
+
+
+def test_scan_mp3_skips_id3_tag_and_junk():
+    tag = b"ID3\x04\x00\x00" + bytes([0, 0, 0, 20]) + bytes(20)
+    info = server.scan_mp3_frames(tag + b"\x00\xff\x00" + mp3_frame(MONO) * 2)
+    assert info["channels"] == 1
+    assert info["duration_seconds"] == round(2 * 1152 / 44100, 3)
+
+
+def test_scan_mp3_rejects_reserved_headers():
+    # Bitrate index 15 is invalid, so the only sync word found is not a frame
+    with pytest.raises(ValueError):
+        server.scan_mp3_frames(b"\xff\xfb\xf0\x00" + bytes(100))
+
+
+def test_scan_mp3_without_frames_raises():
+    with pytest.raises(ValueError):
+        server.scan_mp3_frames(bytes(64))
@@ -0,0 +1,47 @@
+import pytest
+
+import server
+from server import UserRole, UserStatus
+
+
+def user(status, role=UserRole.PUBLIC, committee="central"):
+    return {"status": status, "role": role, "committee": committee}
+
+
+PENDING = user(UserStatus.PENDING)
+PENDING_MEMBER = user(UserStatus.PENDING, UserRole.MEMBER)
+APPROVED = user(UserStatus.APPROVED, UserRole.MEMBER)
+REJECTED = user(UserStatus.REJECTED)
+DISABLED = user(UserStatus.DISABLED, UserRole.MEMBER)
+
+
+@pytest.mark.parametrize("before, after, expected", [
+    (None, PENDING, {"pending_requests": 1}),
+    (None, PENDING_MEMBER, {"pending_requests": 1, "total_members": 1}),
+    (PENDING, APPROVED, {"pending_requests": -1, "approved_members": 1, "total_members": 1}),
+    (PENDING_MEMBER, APPROVED, {"pending_requests": -1, "approved_members": 1}),
+    (PENDING, REJECTED, {"pending_requests": -1, "rejected_members": 1}),
+    (REJECTED, APPROVED, {"rejected_members": -1, "approved_members": 1, "total_members": 1}),
+    (APPROVED, REJECTED, {"approved_members": -1, "rejected_members": 1, "total_members": -1}),
+    (APPROVED, DISABLED, {"approved_members": -1}),
+    (DISABLED, APPROVED, {"approved_members": 1}),
+    (APPROVED, user(UserStatus.APPROVED, UserRole.ADMIN), {}),
+    (APPROVED, user(UserStatus.APPROVED, UserRole.SUPER_ADMIN), {}),
+    (APPROVED, None, {"approved_members": -1, "total_members": -1}),
+    (PENDING, None, {"pending_requests": -1}),
+    (DISABLED, None, {"total_members": -1}),
+    (APPROVED, APPROVED, {}),
+    (None, None, {}),
+])
+def test_user_stats_delta(before, after, expected):
+    assert server.user_stats_delta(before, after) == expected
+
+
+def test_deltas_sum_to_final_contribution():
+    # Any chain of writes moves the counters to exactly what a recount would find
+    chain = [None, PENDING, REJECTED, APPROVED, DISABLED, APPROVED, None]
+    total = {}
+    for before, after in zip(chain, chain[1:]):
+        for counter, value in server.user_stats_delta(before, after).items():
+            total[counter] = total.get(counter, 0) + value
+    assert {counter: value for counter, value in total.items() if value} == {}
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import pytest
+
+import server
+from server import UserRole, UserStatus
+
+
+def user(status, committee="central", role=UserRole.PUBLIC):
+    return {"status": status, "role": role, "committee": committee}
+
+
+PENDING = user(UserStatus.PENDING)
+APPROVED = user(UserStatus.APPROVED, role=UserRole.MEMBER)
+REJECTED = user(UserStatus.REJECTED)
+DISABLED = user(UserStatus.DISABLED, role=UserRole.MEMBER)
+
+
+@pytest.mark.parametrize("before, after, expected", [
+    (None, PENDING, {"central": {"signups": 1, "pending_delta": 1}}),
+    (None, APPROVED, {"central": {"signups": 1}}),
+    (PENDING, APPROVED, {"central": {"approvals": 1, "pending_delta": -1}}),
+    (PENDING, REJECTED, {"central": {"rejections": 1, "pending_delta": -1}}),
+    (REJECTED, APPROVED, {"central": {"approvals": 1}}),
+    (APPROVED, REJECTED, {"central": {"rejections": 1}}),
+    (DISABLED, APPROVED, {}),
+    (APPROVED, DISABLED, {}),
+    (REJECTED, PENDING, {"central": {"pending_delta": 1}}),
+    (PENDING, None, {"central": {"pending_delta": -1}}),
+    (APPROVED, None, {}),
+    (PENDING, PENDING, {}),
+    (APPROVED, user(UserStatus.APPROVED, "district", UserRole.MEMBER), {}),
+    (None, None, {}),
+])
+def test_user_rollup_delta(before, after, expected):
+    assert server.user_rollup_delta(before, after) == expected
+
+
+def test_pending_user_changing_committee_moves_the_backlog():
+    assert server.user_rollup_delta(PENDING, user(UserStatus.PENDING, "district")) == {
+        "central": {"pending_delta": -1},
+        "district": {"pending_delta": 1}
+    }
+
+
+def test_approval_with_committee_change_counts_under_the_new_committee():
+    assert server.user_rollup_delta(PENDING, user(UserStatus.APPROVED, "district", UserRole.MEMBER)) == {
+        "central": {"pending_delta": -1},
+        "district": {"approvals": 1}
+    }
+
+
+def test_missing_committee_is_bucketed_as_unknown():
+    assert server.user_rollup_delta(None, {"status": UserStatus.PENDING}) == {"unknown": {"signups": 1, "pending_delta": 1}}
+
+
+@pytest.mark.parametrize("value, expected", [
+    (datetime(2024, 3, 9, 23, 59), "2024-03-09"),
+    ("2024-03-09T10:00:00", "2024-03-09"),
+    ("2024-03", None),
+    (None, None),
+])
+def test_rollup_day(value, expected):
+    assert server.rollup_day(value) == expected
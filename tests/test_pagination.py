@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+import server
+
+
+def test_cursor_round_trips_datetime_values():
+    doc = {"_id": ObjectId(), "created_at": datetime(2024, 5, 1, 12, 30, 15, 123000)}
+    assert server.decode_cursor(server.encode_cursor(doc, "created_at")) == (doc["created_at"], doc["_id"])
+
+
+def test_cursor_round_trips_plain_values():
+    doc = {"_id": ObjectId(), "order": 7}
+    assert server.decode_cursor(server.encode_cursor(doc, "order")) == (7, doc["_id"])
+
+
+def test_cursor_round_trips_missing_sort_value():
+    doc = {"_id": ObjectId()}
+    assert server.decode_cursor(server.encode_cursor(doc, "created_at")) == (None, doc["_id"])
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", server.encode_cursor({"_id": "x"}, "order")])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as raised:
+        server.decode_cursor(cursor)
+    assert raised.value.status_code == 400
+
+
+def test_no_cursor_keeps_query():
+    assert server.keyset_filter({"type": "news"}, "created_at", -1, None) == {"type": "news"}
+
+
+def test_keyset_filter_ands_with_query():
+    cursor = server.encode_cursor({"_id": ObjectId(), "order": 3}, "order")
+    combined = server.keyset_filter({"committee": "central"}, "order", 1, cursor)
+    assert combined["$and"][0] == {"committee": "central"}
+
+
+def page_through(collection, field, direction, size):
+    """Every document, read in pages the way fetch_page does"""
+    seen = []
+    cursor = None
+    while True:
+        docs = list(
+            collection.find(server.keyset_filter({}, field, direction, cursor))
+            .sort([(field, direction), ("_id", direction)])
+            .limit(size + 1)
+        )
+        seen.extend(docs[:size])
+        if len(docs) <= size:
+            return seen
+        cursor = server.encode_cursor(docs[size - 1], field)
+
+
+@pytest.fixture
+def mixed_collection():
+    mongomock = pytest.importorskip("mongomock")
+    collection = mongomock.MongoClient().db.items
+    start = datetime(2024, 1, 1)
+    docs = [{"_id": ObjectId(), "created_at": start + timedelta(days=index % 4)} for index in range(9)]
+    docs += [{"_id": ObjectId()} for _ in range(3)]
+    docs += [{"_id": ObjectId(), "created_at": None} for _ in range(2)]
+    collection.insert_many(docs)
+    return collection
+
+
+@pytest.mark.parametrize("direction", [1, -1])
+@pytest.mark.parametrize("size", [1, 2, 5])
+def test_pages_cover_every_document_once_in_order(mixed_collection, direction, size):
+    expected = list(mixed_collection.find().sort([("created_at", direction), ("_id", direction)]))
+    assert [doc["_id"] for doc in page_through(mixed_collection, "created_at", direction, size)] == \
+        [doc["_id"] for doc in expected]
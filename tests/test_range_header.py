@@ -0,0 +1,38 @@
+import pytest
+from fastapi import HTTPException
+
+import server
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=10-19", (10, 19)),
+    ("bytes=990-", (990, 999)),
+    ("bytes=0-", (0, 999)),
+    ("bytes=-5", (995, 999)),
+    ("bytes=-5000", (0, 999)),
+    ("bytes=900-5000", (900, 999)),
+    ("BYTES = 1-2", (1, 2)),
+])
+def test_satisfiable_ranges(header, expected):
+    assert server.parse_range_header(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", [None, "", "items=0-10", "bytes=0-1,5-6", "bytes=a-b", "bytes=-"])
+def test_ignored_ranges_send_the_whole_body(header):
+    assert server.parse_range_header(header, 1000) is None
+
+
+@pytest.mark.parametrize("header, size", [
+    ("bytes=1000-", 1000),
+    ("bytes=1000-2000", 1000),
+    ("bytes=20-10", 1000),
+    ("bytes=-0", 1000),
+    ("bytes=0-", 0),
+    ("bytes=-5", 0),
+])
+def test_unsatisfiable_ranges_are_416(header, size):
+    with pytest.raises(HTTPException) as raised:
+        server.parse_range_header(header, size)
+    assert raised.value.status_code == 416
+    assert raised.value.headers == {"Content-Range": f"bytes */{size}"}